@@ -1,8 +1,33 @@
-from fastapi import FastAPI, Query
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from run_scraper import scrape_journalists_from_publishers
+from pydantic import BaseModel, Field
+from run_scraper import (
+    feed_flight, parse_topic_keywords, scrape_journalists_batch, scrape_journalists_from_publishers
+)
+from hunter_cache import get_hunter_cache
+from journalist_store import get_journalist_store
+from feed_cache import feed_cache
+from publisher_health import publisher_health
+from ingestion import ARTICLE_WINDOW, SCRAPER_MODE, article_store, feed_ingestor, query_journalists
+from singleflight import AsyncSingleFlight
+from metrics import REQUEST_SECONDS, log_event, new_request_id, render_metrics, request_id_var, stage_timer
+from streaming import (
+    NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, format_ndjson, format_sse, live_source, ranked_live_source, static_source,
+    stream_scrape_events
+)
+from jobs import JobManager, JobQueueFull
+from enrichment import enrich_journalists, enrich_query_results, close_client, get_email_patterns, hunter_flight, MIN_CONFIDENCE, HUNTER_CONCURRENCY, HUNTER_RATE_LIMIT
+from web_discovery import WEB_DISCOVERY_ENABLED
+from scrape_workers import SCRAPER_PROCESSES, close_worker_pool, get_worker_pool
+from bulk_export import csv_chunks, export_rows, ndjson_chunks
+import transport
+from publishers import registry as publisher_registry
 import os
-import requests
+import time
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -15,9 +40,35 @@ print("=" * 50)
 print("Email Scraper Service Starting...")
 print(f"Environment file: {root_env}")
 print(f"HUNTER_API_KEY loaded: {'Yes' if HUNTER_API_KEY else 'No'}")
+print(f"Hunter concurrency: {HUNTER_CONCURRENCY}, rate limit: {HUNTER_RATE_LIMIT}/s")
+print(f"Scraper mode: {SCRAPER_MODE}" + (
+    f" (/scrape matches the last {ARTICLE_WINDOW / 3600:g}h of ingested articles; SCRAPER_MODE=live fetches per request)"
+    if SCRAPER_MODE == "ingest" else ""
+))
+print(f"HTTP/2: {'on' if transport.HTTP2 else 'off'}, per-host connections: {transport.TRANSPORT_PER_HOST}")
+print(f"Web email discovery: {'on' if WEB_DISCOVERY_ENABLED else 'off'}")
+print(f"Scrape worker processes: {SCRAPER_PROCESSES or 'off'}")
 print("=" * 50)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app):
+    job_manager.start()
+    if SCRAPER_MODE == "ingest":
+        feed_ingestor.start()
+    pool = get_worker_pool()
+    if pool is not None:
+        await run_in_threadpool(pool.start)
+    yield
+    await job_manager.shutdown()
+    feed_ingestor.stop()
+    close_worker_pool()
+    await close_client()
+    transport.close()
+
+
+app = FastAPI(lifespan=lifespan)
+scrape_flight = AsyncSingleFlight("scrape")
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,95 +77,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def find_email_with_hunter(first_name, last_name, domain):
-    if not HUNTER_API_KEY:
-        print(f" HUNTER_API_KEY missing for {first_name} {last_name}")
-        return None, 0, "missing_api_key"
-
-    url = "https://api.hunter.io/v2/email-finder"
-    params = {
-        "first_name": first_name,
-        "last_name": last_name,
-        "domain": domain,
-        "api_key": HUNTER_API_KEY
-    }
 
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag every request with an id for structured logs and record its latency"""
+    request_id = request.headers.get("X-Request-ID") or new_request_id()
+    token = request_id_var.set(request_id)
+    started = time.perf_counter()
+    status = 500
     try:
-        print(f"  [{params.get('first_name', '')} {params.get('last_name', '')}] Searching Hunter @ {domain}")
-        res = requests.get(url, params=params, timeout=5)
-        data = res.json()
-
-        if not res.ok:
-            print(f"Hunter API error: {data}")
-            return None, 0, "api_error"
-
-        if data.get("data") and data["data"].get("email"):
-            email = data["data"]["email"]
-            score = data["data"].get("score", 0)
-            print(f"    ✓ Found: {email} (score: {score})")
-            return (email, score, "hunter")
-        else:
-            print(f"    ✗ Not found")
-    except Exception as e:
-        print(f"Hunter error for {first_name} {last_name}: {e}")
-
-    return None, 0, "not_found"
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        REQUEST_SECONDS.labels(endpoint, str(status)).observe(elapsed)
+        log_event("request", method=request.method, endpoint=endpoint, status=status,
+                  seconds=round(elapsed, 4), query=str(request.query_params))
+        request_id_var.reset(token)
 
 @app.get("/scrape")
-def scrape_journalists(topic: str = Query(...), geography: str = Query(None)):
+async def scrape_journalists(
+    topic: str = Query(...),
+    geography: str = Query(None),
+    live: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1, description="enrich and return only the N most relevant journalists"),
+):
     print(f"\n{'='*60}")
     print(f"Starting scrape for topic: {topic}")
     if geography:
         print(f"Filtering by geography: {geography}")
     print(f"{'='*60}\n")
 
-    journalists = scrape_journalists_from_publishers(topic, geography)
-    print(f"\nFound {len(journalists)} journalists from scraper\n")
+    use_store = SCRAPER_MODE == "ingest" and not live and feed_ingestor.ready.is_set()
+
+    # Identical queries already in flight share one scrape + enrichment
+    regions = publisher_registry.current().regions(geography)
+    key = (tuple(sorted(set(parse_topic_keywords(topic)))), tuple(regions), use_store, limit)
+    return await scrape_flight.do(key, run_scrape, topic, geography, use_store, limit)
 
-    enriched = []
-    MIN_CONFIDENCE = 70
-    stats = {"verified": 0, "low_confidence": 0, "fallback": 0, "not_found": 0}
+
+async def run_scrape(topic, geography, use_store, limit=None):
+    with stage_timer("scrape", topic=topic, geography=geography, source="store" if use_store else "live"):
+        if use_store:
+            journalists = query_journalists(article_store, topic, geography, limit)
+        else:
+            # Feed fetching is blocking; keep it off the event loop
+            journalists = await run_in_threadpool(scrape_journalists_from_publishers, topic, geography, limit)
+    print(f"\nFound {len(journalists)} journalists from scraper\n")
 
     print(f"\nEnriching {len(journalists)} journalists with Hunter.io...")
-    for idx, j in enumerate(journalists, 1):
-        # Skip Hunter if no real author name
-        if not j["first_name"] or not j["last_name"]:
-            enriched.append({
-                **j,
-                "email": f"editor@{j['domain']}",
-                "email_confidence": 0,
-                "email_source": "fallback"
-            })
-            stats["fallback"] += 1
-            continue
-
-        email, confidence, source = find_email_with_hunter(
-            j["first_name"],
-            j["last_name"],
-            j["domain"]
-        )
-
-        # Reject low-confidence emails
-        if not email or confidence < MIN_CONFIDENCE:
-            enriched.append({
-                **j,
-                "email": f"editor@{j['domain']}",
-                "email_confidence": confidence,
-                "email_source": "low_confidence"
-            })
-            if confidence == 0:
-                stats["not_found"] += 1
-            else:
-                stats["low_confidence"] += 1
-            continue
-
-        enriched.append({
-            **j,
-            "email": email,
-            "email_confidence": confidence,
-            "email_source": source
-        })
-        stats["verified"] += 1
+    enriched, stats = await enrich_journalists(journalists, HUNTER_API_KEY)
 
     print(f"\n{'='*60}")
     print(f" Enrichment Summary:")
@@ -123,9 +139,221 @@ def scrape_journalists(topic: str = Query(...), geography: str = Query(None)):
     print(f" No email found: {stats['not_found']}")
     print(f" Fallback emails: {stats['fallback']}")
     print(f" Total journalists: {len(enriched)}")
+    print(f" Hunter cache: {get_hunter_cache().stats()}")
     print(f"{'='*60}\n")
+    log_event("enrichment_summary", topic=topic, journalists=len(enriched), **stats)
+
+    return [j.to_dict() for j in enriched]
+
+
+class ScrapeQuery(BaseModel):
+    topic: str
+    geography: Optional[str] = None
+    # Only the N most relevant journalists are enriched and returned
+    limit: Optional[int] = Field(None, ge=1)
+
+
+class BatchScrapeRequest(BaseModel):
+    queries: List[ScrapeQuery] = Field(..., min_length=1)
+    live: bool = False
+
+
+@app.post("/scrape/batch")
+async def scrape_journalists_batch_endpoint(request: BatchScrapeRequest):
+    """
+    Run several topic/geography queries in one pass: every feed is fetched
+    once, and each unique journalist is enriched once.
+    """
+    queries = [q.model_dump() for q in request.queries]
+    print(f"\nBatch scrape for {len(queries)} queries")
+
+    if SCRAPER_MODE == "ingest" and not request.live and feed_ingestor.ready.is_set():
+        result_lists = [query_journalists(article_store, q["topic"], q["geography"], q["limit"]) for q in queries]
+    else:
+        result_lists = await run_in_threadpool(scrape_journalists_batch, queries)
+
+    enriched_lists, stats = await enrich_query_results(result_lists, HUNTER_API_KEY)
+    print(f"Batch enrichment summary: {stats}")
+
+    return {
+        "results": [
+            {**q, "journalists": [j.to_dict() for j in journalists]}
+            for q, journalists in zip(queries, enriched_lists)
+        ],
+        "enrichment": stats,
+    }
+
+
+def scrape_source(topic, geography, live, limit=None):
+    if SCRAPER_MODE == "ingest" and not live and feed_ingestor.ready.is_set():
+        return static_source(query_journalists(article_store, topic, geography, limit))
+    if limit:
+        return ranked_live_source(topic, geography, limit)
+    return live_source(topic, geography)
+
+
+def stream_response(events, format):
+    formatter, media_type = (format_sse, SSE_MEDIA_TYPE) if format == "sse" else (format_ndjson, NDJSON_MEDIA_TYPE)
+
+    async def body():
+        async for event, data in events:
+            yield formatter(event, data)
+
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
 
-    return enriched
+
+@app.get("/scrape/stream")
+async def scrape_journalists_stream(
+    topic: str = Query(...),
+    geography: str = Query(None),
+    live: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+):
+    """
+    Streaming variant of /scrape. Emits a "journalist" event as soon as each
+    publisher is parsed, then an "enrichment" event per resolved email, and a
+    final "done" event with the enrichment summary. With a `limit`, live
+    journalists are held back until every feed is in and ranked.
+    """
+    print(f"\nStreaming scrape for topic: {topic} (geography: {geography or 'all'}, format: {format})")
+
+    source = scrape_source(topic, geography, live, limit)
+    return stream_response(stream_scrape_events(source, HUNTER_API_KEY), format)
+
+
+@app.get("/scrape/export")
+async def export_journalists(
+    topic: str = Query(...),
+    geography: str = Query(None),
+    live: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """
+    /scrape results as rows for the Supabase journalists table, one per
+    upsert key (email, else name + domain), streamed in chunks as NDJSON
+    (for bulk_export.py's importer) or COPY-ready CSV.
+    """
+    journalists = await scrape_journalists(topic=topic, geography=geography, live=live, limit=limit)
+    rows = export_rows(journalists)
+    chunks, media_type = (csv_chunks(rows), "text/csv") if format == "csv" else (ndjson_chunks(rows), NDJSON_MEDIA_TYPE)
+    return StreamingResponse(chunks, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="journalists.{format}"'})
+
+
+class ScrapeJobRequest(ScrapeQuery):
+    live: bool = False
+
+
+job_manager = JobManager(
+    lambda params: scrape_source(params["topic"], params["geography"], params["live"], params.get("limit")),
+    HUNTER_API_KEY,
+)
+
+
+@app.post("/scrape/jobs", status_code=202)
+async def create_scrape_job(request: ScrapeJobRequest):
+    """
+    Queue a scrape and return its job id right away. Poll
+    /scrape/jobs/{job_id} or stream /scrape/jobs/{job_id}/events for
+    progress; finished results are kept for SCRAPE_JOB_TTL seconds.
+    """
+    try:
+        job = job_manager.submit(request.model_dump())
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    print(f"\nQueued scrape job {job.id} for topic: {request.topic}")
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/scrape/jobs/{job_id}")
+async def get_scrape_job(job_id: str):
+    # On the event loop, so the snapshot can't race the job's own updates
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@app.get("/scrape/jobs/{job_id}/events")
+async def scrape_job_events(job_id: str, format: str = Query("sse", pattern="^(ndjson|sse)$")):
+    """Replay a job's events so far, then follow it live until it finishes"""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return stream_response(job_manager.events(job_id), format)
+
+
+@app.get("/journalists/search")
+def search_journalists(
+    topic: str = Query(...),
+    geography: str = Query(None),
+    since_days: float = Query(None, gt=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Search the accumulated journalist profiles by topic, optionally limited
+    to a geography and to journalists who covered the topic in the last
+    `since_days` days. No feeds are fetched and nothing is enriched.
+    """
+    regions = None
+    if geography:
+        regions = publisher_registry.current().regions(geography)
+    since = time.time() - since_days * 24 * 60 * 60 if since_days else None
+    journalists = get_journalist_store().search(parse_topic_keywords(topic), regions, since, limit)
+    return {"topic": topic, "geography": geography, "journalists": journalists}
+
+
+@app.get("/metrics")
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/health")
+def health():
+    """
+    Where /scrape results come from. In "ingest" mode (the default) a
+    background thread polls every feed and /scrape matches only articles
+    published in the last `article_window_hours`, falling back to live
+    fetches until the first poll is done; "live" fetches and matches every
+    feed entry per request.
+    """
+    ingest = SCRAPER_MODE == "ingest"
+    return {
+        "status": "ok",
+        "scraper_mode": SCRAPER_MODE,
+        "article_window_hours": ARTICLE_WINDOW / 3600 if ingest else None,
+        "ingest_ready": feed_ingestor.ready.is_set() if ingest else None,
+        "stored_articles": len(article_store) if ingest else None,
+        "scrape_worker_processes": SCRAPER_PROCESSES,
+    }
+
+
+@app.get("/health/publishers")
+def publishers_health():
+    """
+    Circuit breaker state and latency per feed. With SCRAPER_PROCESSES set,
+    feeds are fetched in worker processes and each shows the state its
+    worker reported at the end of its last scrape.
+    """
+    return publisher_health.snapshot()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    Cache sizes and hit counters. With SCRAPER_PROCESSES set, "feeds" sums
+    this process and the worker processes' last reports; the "feeds"
+    single-flight counters only cover fetches made in this process.
+    """
+    return {
+        "hunter": get_hunter_cache().stats(),
+        "feeds": feed_cache.stats(),
+        "journalists": get_journalist_store().stats(),
+        "email_patterns": get_email_patterns().stats(),
+        "singleflight": {flight.name: flight.stats() for flight in (scrape_flight, feed_flight, hunter_flight)},
+    }
 
 if __name__ == "__main__":
     import uvicorn
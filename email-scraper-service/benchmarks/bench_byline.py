@@ -0,0 +1,137 @@
+"""
+Byline parsing micro-benchmark.
+
+Builds a corpus of raw bylines from the fixture feeds plus a set of harder
+forms (co-author lists, honorifics, outlet suffixes), repeats it the way
+bylines repeat across feeds and polls, and reports parsing throughput for
+the previous uncompiled parser and for byline.py cold (empty cache) and
+warm.
+
+    python benchmarks/bench_byline.py
+    python benchmarks/bench_byline.py --repeat 200 --json
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+import feedparser  # noqa: E402
+
+import byline  # noqa: E402
+from benchmarks.fixtures import load_payload  # noqa: E402
+from publishers import PUBLISHERS  # noqa: E402
+
+EXTRA_BYLINES = [
+    "By Jane Doe, John Roe and Ann Poe",
+    "Jane Doe | Reuters",
+    "By Dr. Priya Patel - The Verge",
+    "jane.doe@example.com (Jane Doe)",
+    "Mary Ann Evans & Prof. Sam Lee Jr.",
+    "Smith, Jones and Brown",
+    "Associated Press",
+    "Editorial Staff",
+]
+
+
+def legacy_extract_author(entry, author_fields):
+    for field in author_fields:
+        value = entry.get(field)
+        if value:
+            return value.replace("By ", "").strip()
+    return ""
+
+
+def legacy_parse_name(full_name):
+    """The parser byline.py replaced: no precompiled patterns, no memoization"""
+    if not full_name:
+        return []
+    bad_terms = ["Editorial", "Staff", "Team", "Newsroom"]
+    if any(bad.lower() in full_name.lower() for bad in bad_terms):
+        return []
+    normalized = re.sub(r'\s+and\s+', '|', full_name, flags=re.IGNORECASE)
+    normalized = re.sub(r'\s*&\s*', '|', normalized)
+    expanded_names = []
+    for name in (n.strip() for n in normalized.split('|')):
+        if ',' in name:
+            parts = [p.strip() for p in name.split(',')]
+            if all(len(p.split()) == 1 for p in parts):
+                continue
+            expanded_names.extend(parts)
+        else:
+            expanded_names.append(name)
+    results = []
+    for name in expanded_names:
+        parts = name.strip().split()
+        if len(parts) == 1:
+            results.append((parts[0], ""))
+        elif len(parts) >= 2:
+            results.append((parts[0], " ".join(parts[1:])))
+    return results
+
+
+def build_corpus():
+    """(entry, author_fields) pairs from every fixture feed, plus the extra forms"""
+    corpus = []
+    for pub in PUBLISHERS:
+        for entry in feedparser.parse(load_payload(pub)).entries:
+            corpus.append((entry, pub["author_fields"]))
+    corpus.extend(({"author": value}, ["author"]) for value in EXTRA_BYLINES)
+    return corpus
+
+
+def run(extract, parse, corpus, repeat):
+    started = time.perf_counter()
+    names = 0
+    for _ in range(repeat):
+        for entry, author_fields in corpus:
+            names += len(parse(extract(entry, author_fields)))
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 4),
+        "bylines_per_second": round(len(corpus) * repeat / elapsed),
+        "names": names,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100, help="passes over the corpus")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    unique = len({legacy_extract_author(entry, fields) for entry, fields in corpus})
+
+    report = {"bylines": len(corpus), "unique_bylines": unique, "repeat": args.repeat}
+    report["legacy"] = run(legacy_extract_author, legacy_parse_name, corpus, args.repeat)
+
+    def cold_parse(value):
+        byline.parse_name.cache_clear()
+        byline.clean_byline.cache_clear()
+        return byline.parse_name(value)
+
+    report["cold"] = run(byline.extract_author, cold_parse, corpus, args.repeat)
+    byline.parse_name.cache_clear()
+    byline.clean_byline.cache_clear()
+    report["warm"] = run(byline.extract_author, byline.parse_name, corpus, args.repeat)
+    report["cache"] = byline.parse_name.cache_info()._asdict()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nByline parsing ({len(corpus)} bylines, {unique} unique, {args.repeat} passes)")
+    for name in ("legacy", "cold", "warm"):
+        result = report[name]
+        print(f"  {name:<7} {result['bylines_per_second']:>10,} bylines/s  "
+              f"({result['seconds']}s, {result['names']} names)")
+    print(f"  parse_name cache: {report['cache']}")
+
+
+if __name__ == "__main__":
+    main()
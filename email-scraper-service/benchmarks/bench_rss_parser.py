@@ -0,0 +1,89 @@
+"""
+Feed parsing micro-benchmark: CPU time per feed for feedparser versus the
+iterparse fast path in rss_parser.py, over every fixture payload.
+
+    python benchmarks/bench_rss_parser.py
+    python benchmarks/bench_rss_parser.py --max-items 0 --repeat 10 --json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+import feedparser  # noqa: E402
+
+import rss_parser  # noqa: E402
+from benchmarks.fixtures import load_payload  # noqa: E402
+from publishers import PUBLISHERS  # noqa: E402
+from run_scraper import entry_to_article  # noqa: E402
+
+
+def time_parser(parse, payloads, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        for body in payloads:
+            parse(body)
+    cpu = time.process_time() - started
+    return {
+        "cpu_seconds": round(cpu, 4),
+        "cpu_ms_per_feed": round(cpu / (len(payloads) * repeat) * 1000, 3),
+    }
+
+
+def compare(payloads, pubs, max_items):
+    """Count entries that reduce to a different Article under the two parsers"""
+    mismatches = 0
+    fallbacks = 0
+    for pub, body in zip(pubs, payloads):
+        expected = feedparser.parse(body).entries
+        expected = expected[:max_items] if max_items else expected
+        try:
+            actual = rss_parser.parse_entries_fast(body, max_items)
+        except rss_parser.FeedParseError:
+            fallbacks += 1
+            continue
+        for want, got in zip(expected, actual):
+            if entry_to_article(want, pub) != entry_to_article(got, pub):
+                mismatches += 1
+        mismatches += abs(len(expected) - len(actual))
+    return mismatches, fallbacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the fixture feeds")
+    parser.add_argument("--max-items", type=int, default=rss_parser.FEED_MAX_ITEMS,
+                        help="entries read per feed (0 = all)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    payloads = [load_payload(pub) for pub in PUBLISHERS]
+    max_items = args.max_items
+
+    report = {
+        "feeds": len(payloads),
+        "repeat": args.repeat,
+        "max_items": max_items,
+        "feedparser": time_parser(feedparser.parse, payloads, args.repeat),
+        "fast": time_parser(lambda body: rss_parser.parse_entries_fast(body, max_items), payloads, args.repeat),
+    }
+    report["speedup"] = round(report["feedparser"]["cpu_seconds"] / report["fast"]["cpu_seconds"], 1)
+    report["mismatched_entries"], report["fallback_feeds"] = compare(payloads, PUBLISHERS, max_items)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nFeed parsing ({len(payloads)} feeds x {args.repeat}, max items {max_items or 'all'})")
+    print(f"  feedparser:  {report['feedparser']['cpu_ms_per_feed']} ms/feed CPU")
+    print(f"  fast path:   {report['fast']['cpu_ms_per_feed']} ms/feed CPU ({report['speedup']}x)")
+    print(f"  articles differing from feedparser: {report['mismatched_entries']}, "
+          f"{report['fallback_feeds']} feeds needing the fallback")
+
+
+if __name__ == "__main__":
+    main()
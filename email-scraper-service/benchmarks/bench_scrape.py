@@ -0,0 +1,217 @@
+"""
+End-to-end /scrape benchmark, fully offline.
+
+Starts the fixture server (recorded feeds + fake Hunter), points every
+publisher and the Hunter client at it, runs the FastAPI app in-process
+under uvicorn and drives /scrape with concurrent clients. Reports latency
+percentiles, requests/sec, feed parsing CPU time and peak memory.
+
+    python benchmarks/bench_scrape.py --requests 40 --concurrency 4
+    python benchmarks/bench_scrape.py --mode ingest --failure-rate 0.1 --hang-rate 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from benchmarks.fixture_server import FixtureConfig, start_fixture_server  # noqa: E402
+
+DEFAULT_TOPICS = ["AI in EdTech, AI in Education", "startup funding", "climate", "privacy and security", "robotics"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class ParseTimer:
+    """Wraps the feed parser to accumulate the CPU time spent inside it"""
+
+    def __init__(self, parse):
+        self._parse = parse
+        self.cpu_seconds = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        started = time.thread_time()
+        try:
+            return self._parse(*args, **kwargs)
+        finally:
+            elapsed = time.thread_time() - started
+            with self._lock:
+                self.cpu_seconds += elapsed
+                self.calls += 1
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def configure_service(args, fixture_server, local_publishers):
+    """Point the service at the fixture server; must run before the app is imported"""
+    os.environ["SCRAPER_MODE"] = args.mode
+    os.environ["SCRAPER_RSS_PARSER"] = args.parser
+    os.environ["HUNTER_API_KEY"] = "benchmark"
+    os.environ["HUNTER_EMAIL_FINDER_URL"] = fixture_server.hunter_url
+    os.environ["HUNTER_RATE_LIMIT"] = str(args.hunter_rate)
+    state_dir = Path(tempfile.mkdtemp(prefix="bench-state-"))
+    os.environ["HUNTER_CACHE_PATH"] = str(state_dir / "hunter_cache.sqlite3")
+    os.environ["SCRAPE_JOBS_PATH"] = str(state_dir / "scrape_jobs.sqlite3")
+    os.environ["JOURNALIST_STORE_PATH"] = str(state_dir / "journalists.sqlite3")
+    os.environ["EMAIL_PATTERNS_PATH"] = str(state_dir / "email_patterns.sqlite3")
+
+    import publishers
+    # Fixture URLs for every module, and no reloading publishers.json underneath the run
+    publishers.registry.replace(local_publishers)
+
+
+async def drive_load(base_url, topics, total, concurrency, geography, limit=None):
+    import httpx
+
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        async def one(i):
+            nonlocal errors
+            params = {"topic": topics[i % len(topics)]}
+            if geography:
+                params["geography"] = geography
+            if limit:
+                params["limit"] = limit
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/scrape", params=params)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        wall = time.perf_counter() - started
+
+        cache_stats = (await client.get("/cache/stats")).json()
+
+    return latencies, errors, wall, cache_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--mode", choices=["live", "ingest"], default="live")
+    parser.add_argument("--parser", choices=["fast", "feedparser"], default="fast")
+    parser.add_argument("--geography", default=None)
+    parser.add_argument("--limit", type=int, default=None, help="only enrich the N most relevant journalists")
+    parser.add_argument("--topics", nargs="*", default=DEFAULT_TOPICS)
+    parser.add_argument("--latency", type=float, default=0.1, help="feed latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of feed requests answered 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of feed requests that hang")
+    parser.add_argument("--hunter-latency", type=float, default=0.05)
+    parser.add_argument("--hunter-rate", type=float, default=1000, help="token bucket rate for the fake Hunter")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report Python heap peak (slower)")
+    parser.add_argument("--verbose", action="store_true", help="keep the service's own logging")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    config = FixtureConfig(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                           hang_rate=args.hang_rate, hunter_latency=args.hunter_latency)
+    fixture_server, local_publishers = start_fixture_server(config)
+    configure_service(args, fixture_server, local_publishers)
+
+    import rss_parser
+    parse_timer = ParseTimer(rss_parser.parse_entries)
+    rss_parser.parse_entries = parse_timer
+
+    import uvicorn
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        import app as service
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(service.app, host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+        while not server.started:
+            time.sleep(0.05)
+
+        if args.mode == "ingest":
+            service.feed_ingestor.ready.wait(timeout=120)
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        latencies, errors, wall, cache_stats = asyncio.run(
+            drive_load(f"http://127.0.0.1:{port}", args.topics, args.requests, args.concurrency, args.geography,
+                       args.limit)
+        )
+        heap_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+
+        server.should_exit = True
+
+    report = {
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(args.requests / wall, 2) if wall else None,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+            "p50": round(percentile(latencies, 50), 4),
+            "p90": round(percentile(latencies, 90), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(max(latencies), 4) if latencies else None,
+        },
+        "feed_parsing": {
+            "parser": rss_parser.RSS_PARSER,
+            "calls": parse_timer.calls,
+            "cpu_seconds": round(parse_timer.cpu_seconds, 4),
+            "cpu_ms_per_call": round(parse_timer.cpu_seconds / parse_timer.calls * 1000, 3) if parse_timer.calls else None,
+        },
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "python_heap_peak_mb": round(heap_peak / 1024 / 1024, 1) if heap_peak is not None else None,
+        "fixture_server": dict(config.counters),
+        "service_caches": cache_stats,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    lat = report["latency_seconds"]
+    print(f"\n/scrape benchmark ({args.mode} mode, {args.requests} requests, concurrency {args.concurrency})")
+    print(f"  wall time:        {report['wall_seconds']}s")
+    print(f"  throughput:       {report['requests_per_second']} req/s ({errors} errors)")
+    print(f"  latency:          p50 {lat['p50']}s  p90 {lat['p90']}s  p95 {lat['p95']}s  "
+          f"p99 {lat['p99']}s  max {lat['max']}s")
+    print(f"  feed parse CPU:   {report['feed_parsing']['cpu_seconds']}s over {parse_timer.calls} parses "
+          f"({report['feed_parsing']['cpu_ms_per_call']} ms/parse, {rss_parser.RSS_PARSER} parser)")
+    print(f"  peak RSS:         {report['peak_rss_mb']} MB"
+          + (f", Python heap peak {report['python_heap_peak_mb']} MB" if heap_peak is not None else ""))
+    print(f"  fixture server:   {report['fixture_server']}")
+
+
+if __name__ == "__main__":
+    main()
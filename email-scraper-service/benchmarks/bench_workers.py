@@ -0,0 +1,145 @@
+"""
+Scrape throughput against worker process count, fully offline.
+
+Serves `--feeds` distinct synthetic feeds from the fixture server and
+times scrape_journalists_from_publishers (fetch, parse, match, dedup and
+rank; no enrichment) in-process and with each SCRAPER_PROCESSES setting.
+Every round uses fresh feed URLs, so each scrape really parses every feed.
+
+    python benchmarks/bench_workers.py --feeds 300 --processes 0 1 2 4 8
+    python benchmarks/bench_workers.py --parser fast --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from benchmarks.fixture_server import FixtureConfig, start_fixture_server  # noqa: E402
+from publishers import PUBLISHERS  # noqa: E402
+
+
+def bench_publishers(count):
+    """`count` publishers cycling over the registry, each with its own synthetic feed"""
+    cloned = []
+    for i in range(count):
+        pub = PUBLISHERS[i % len(PUBLISHERS)]
+        # A new name and feed URL means no recording, so every clone gets a distinct synthetic feed
+        cloned.append({**pub, "name": f"{pub['name']} {i}", "rss": f"{pub['rss']}#bench-{i}"})
+    return cloned
+
+
+@contextlib.contextmanager
+def quiet_fd(enabled=True):
+    """Silence stdout at the file descriptor, which spawned workers inherit"""
+    if not enabled:
+        yield
+        return
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def main():
+    default_processes = sorted({0, 1, 2, os.cpu_count() or 1})
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="*", default=default_processes,
+                        help="SCRAPER_PROCESSES settings to compare; 0 is the in-process thread pool")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--parser", choices=["fast", "feedparser"], default="feedparser")
+    parser.add_argument("--topic", default="AI in EdTech, startup funding, climate")
+    parser.add_argument("--latency", type=float, default=0.01, help="feed latency in seconds")
+    parser.add_argument("--verbose", action="store_true", help="keep the service's own logging")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    config = FixtureConfig(latency=args.latency, jitter=0.0)
+    fixture_server, local_publishers = start_fixture_server(config, publishers=bench_publishers(args.feeds))
+
+    # Workers are spawned and inherit the environment, not this process's module state
+    state_dir = Path(tempfile.mkdtemp(prefix="bench-workers-"))
+    os.environ["SCRAPER_MODE"] = "live"
+    os.environ["SCRAPER_RSS_PARSER"] = args.parser
+    os.environ["SCRAPER_FETCH_DEADLINE"] = "120"
+    os.environ["HUNTER_CACHE_PATH"] = str(state_dir / "hunter_cache.sqlite3")
+    os.environ["JOURNALIST_STORE_PATH"] = str(state_dir / "journalists.sqlite3")
+    os.environ["EMAIL_PATTERNS_PATH"] = str(state_dir / "email_patterns.sqlite3")
+
+    import publishers
+    import scrape_workers
+    from run_scraper import scrape_journalists_from_publishers
+
+    runs = []
+    for processes in args.processes:
+        scrape_workers.close_worker_pool()
+        scrape_workers.SCRAPER_PROCESSES = processes
+        walls = []
+        journalists = None
+        with quiet_fd(not args.verbose):
+            pool = scrape_workers.get_worker_pool()
+            if pool is not None:
+                pool.start()
+            for round_ in range(args.rounds):
+                # Fresh feed URLs: cold feed caches everywhere, so every feed is parsed
+                publishers.registry.replace(
+                    [{**pub, "rss": f"{pub['rss']}?run={processes}-{round_}"} for pub in local_publishers]
+                )
+                started = time.perf_counter()
+                journalists = scrape_journalists_from_publishers(args.topic)
+                walls.append(time.perf_counter() - started)
+        scrape_workers.close_worker_pool()
+
+        wall = statistics.median(walls)
+        runs.append({
+            "processes": processes,
+            "wall_seconds": round(wall, 3),
+            "feeds_per_second": round(args.feeds / wall, 1),
+            "journalists": len(journalists),
+        })
+
+    baseline = runs[0]["wall_seconds"]
+    for run in runs:
+        run["speedup"] = round(baseline / run["wall_seconds"], 2) if run["wall_seconds"] else None
+
+    report = {
+        "feeds": args.feeds,
+        "rounds": args.rounds,
+        "parser": args.parser,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+        "fixture_server": dict(config.counters),
+    }
+    fixture_server.shutdown()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nScrape scaling ({args.feeds} feeds, {args.parser} parser, {os.cpu_count()} CPUs, "
+          f"median of {args.rounds} rounds)")
+    for run in runs:
+        label = "in-process" if run["processes"] == 0 else f"{run['processes']} processes"
+        print(f"  {label:>12}: {run['wall_seconds']:>7}s  {run['feeds_per_second']:>7} feeds/s  "
+              f"x{run['speedup']}  ({run['journalists']} journalists)")
+
+
+if __name__ == "__main__":
+    main()
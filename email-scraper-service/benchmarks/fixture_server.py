@@ -0,0 +1,164 @@
+"""
+Local stand-in for the outside world: serves recorded feeds for every
+publisher and a fake Hunter email-finder, with configurable latency and
+failure injection.
+
+    python benchmarks/fixture_server.py --port 8765 --latency 0.2 --failure-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import load_payload, slugify  # noqa: E402
+from publishers import PUBLISHERS  # noqa: E402
+
+
+class FixtureConfig:
+    def __init__(self, latency=0.1, jitter=0.05, failure_rate=0.0, hang_rate=0.0,
+                 hang_seconds=30.0, hunter_latency=0.1, hunter_hit_rate=0.7, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.hunter_latency = hunter_latency
+        self.hunter_hit_rate = hunter_hit_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"feed_requests": 0, "feed_not_modified": 0, "feed_failures": 0, "hunter_requests": 0}
+
+    def roll(self):
+        with self.lock:
+            return self.rng.random()
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/xml", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/feeds/"):
+            self._serve_feed(url.path[len("/feeds/"):])
+        elif url.path == "/v2/email-finder":
+            self._serve_hunter(parse_qs(url.query))
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _serve_feed(self, slug):
+        config = self.server.config
+        config.count("feed_requests")
+        payload = self.server.feeds.get(slug)
+        if payload is None:
+            self._send(404, b"unknown feed", "text/plain")
+            return
+
+        time.sleep(max(0.0, config.latency + (config.roll() * 2 - 1) * config.jitter))
+
+        roll = config.roll()
+        if roll < config.hang_rate:
+            config.count("feed_failures")
+            time.sleep(config.hang_seconds)
+        elif roll < config.hang_rate + config.failure_rate:
+            config.count("feed_failures")
+            self._send(503, b"injected failure", "text/plain")
+            return
+
+        etag = self.server.etags[slug]
+        if self.headers.get("If-None-Match") == etag:
+            config.count("feed_not_modified")
+            self._send(304, headers={"ETag": etag})
+            return
+        self._send(200, payload, headers={"ETag": etag})
+
+    def _serve_hunter(self, params):
+        config = self.server.config
+        config.count("hunter_requests")
+        time.sleep(config.hunter_latency)
+
+        first = params.get("first_name", [""])[0].lower()
+        last = params.get("last_name", [""])[0].lower().replace(" ", "")
+        domain = params.get("domain", [""])[0]
+        # Deterministic per person so repeated runs agree
+        score_seed = int(hashlib.md5(f"{first}|{last}|{domain}".encode()).hexdigest(), 16) % 100
+        if score_seed / 100 < config.hunter_hit_rate:
+            data = {"email": f"{first}.{last}@{domain}", "score": 50 + score_seed // 2}
+        else:
+            data = {"email": None, "score": None}
+        self._send(200, json.dumps({"data": data}).encode(), "application/json")
+
+
+def start_fixture_server(config=None, port=0, publishers=PUBLISHERS):
+    """
+    Start the fixture server on a background thread.
+    Returns the server and a copy of `publishers` pointing at it.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.daemon_threads = True
+    server.config = config or FixtureConfig()
+    server.feeds = {}
+    server.etags = {}
+
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    local_publishers = []
+    for pub in publishers:
+        slug = slugify(pub["name"])
+        payload = load_payload(pub)
+        server.feeds[slug] = payload
+        server.etags[slug] = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        local_publishers.append({**pub, "rss": f"{base_url}/feeds/{slug}"})
+
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    server.base_url = base_url
+    server.hunter_url = f"{base_url}/v2/email-finder"
+    return server, local_publishers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hunter-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    config = FixtureConfig(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                           hang_rate=args.hang_rate, hunter_latency=args.hunter_latency)
+    server, publishers = start_fixture_server(config, port=args.port)
+    print(f"Serving {len(publishers)} feeds at {server.base_url}/feeds/<slug>")
+    print(f"Fake Hunter email-finder at {server.hunter_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Bulk export of enriched journalists for the Supabase `journalists` table,
+and the matching batched importer.
+
+    python bulk_export.py import journalists.ndjson --sqlite /tmp/journalists.db
+    python bulk_export.py import journalists.ndjson --dsn postgresql://...   # needs psycopg
+
+Rows are upserted by email when they have one, else by first name, last
+name and domain (see the add_journalist_bulk_upsert_keys migration).
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+
+# Rows per export chunk and per import statement
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 500))
+
+# The journalists table columns the scraper fills, in export order
+EXPORT_COLUMNS = (
+    "email", "first_name", "last_name", "publication_name", "domain",
+    "topics", "recent_articles", "email_confidence", "email_source",
+)
+# Refreshed on conflict; unsubscribe state and created_at are never touched
+UPDATE_COLUMNS = EXPORT_COLUMNS[1:]
+NAME_KEY = ("first_name", "last_name", "domain")
+# Enrichment results whose email is the outlet's shared editor@ address;
+# it can't identify a person, so those rows are keyed by name instead
+SHARED_EMAIL_SOURCES = {"fallback", "low_confidence"}
+# NULL in CSV exports; csv.writer writes None and "" alike, as an empty field
+CSV_NULL = "\\N"
+
+# Local stand-in for the Supabase table, migrations applied
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS journalists (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT DEFAULT '',
+        last_name TEXT DEFAULT '',
+        email TEXT UNIQUE,
+        city TEXT DEFAULT '',
+        state TEXT DEFAULT '',
+        country TEXT DEFAULT '',
+        publication_name TEXT DEFAULT '',
+        domain TEXT NOT NULL DEFAULT '',
+        email_confidence INTEGER DEFAULT 0,
+        email_source TEXT DEFAULT 'hunter',
+        topics TEXT DEFAULT '[]',
+        recent_articles TEXT DEFAULT '[]',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        unsubscribed INTEGER DEFAULT 0,
+        unsubscribed_at TEXT
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS journalists_name_domain_key
+        ON journalists (first_name, last_name, domain) WHERE email IS NULL;
+"""
+
+
+def export_row(journalist):
+    """One /scrape result (Journalist.to_dict) as a journalists table row"""
+    email = (journalist.get("email") or "").strip() or None
+    if journalist.get("email_source") in SHARED_EMAIL_SOURCES:
+        email = None
+    return {
+        "email": email,
+        "first_name": journalist.get("first_name") or "",
+        "last_name": journalist.get("last_name") or "",
+        "publication_name": journalist.get("publication_name") or "",
+        "domain": journalist.get("domain") or "",
+        "topics": list(journalist.get("topics") or []),
+        "recent_articles": list(journalist.get("recent_articles") or []),
+        "email_confidence": journalist.get("email_confidence") or 0,
+        "email_source": journalist.get("email_source") or "scraper",
+    }
+
+
+def upsert_key(row):
+    if row["email"]:
+        return ("email", row["email"])
+    return ("name",) + tuple(row[column] for column in NAME_KEY)
+
+
+def unique_rows(rows):
+    """
+    One row per upsert key, keeping the most confident email and the
+    first-seen order. Postgres rejects an upsert statement that touches
+    the same row twice, so chunks must not repeat a key.
+    """
+    best = {}
+    for row in rows:
+        key = upsert_key(row)
+        current = best.get(key)
+        if current is None or row["email_confidence"] > current["email_confidence"]:
+            best[key] = row
+    return list(best.values())
+
+
+def export_rows(journalists):
+    return unique_rows(export_row(journalist) for journalist in journalists)
+
+
+def chunked(rows, size=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def ndjson_chunks(rows, size=EXPORT_CHUNK_ROWS):
+    """NDJSON text, `size` rows per chunk"""
+    for chunk in chunked(rows, size):
+        yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in chunk)
+
+
+def pg_array(values):
+    """A Postgres text[] literal, as COPY expects it"""
+    return "{" + ",".join('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values) + "}"
+
+
+def csv_chunks(rows, size=EXPORT_CHUNK_ROWS):
+    """
+    COPY-ready CSV, header first and `size` rows per chunk: topics as a
+    text[] literal, recent_articles as JSON and a missing email as
+    CSV_NULL. Empty strings stay empty strings (a single-name byline has
+    an empty last_name, which must not load as NULL or it would never
+    match the name key). Load it into a staging table with
+    `\\copy ... FROM 'file.csv' WITH (FORMAT csv, HEADER true, NULL '\\N')`.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunked(rows, size):
+        for row in chunk:
+            writer.writerow([
+                pg_array(row["topics"]) if column == "topics"
+                else json.dumps(row[column], separators=(",", ":")) if column == "recent_articles"
+                else CSV_NULL if row[column] is None
+                else row[column]
+                for column in EXPORT_COLUMNS
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class JournalistImporter:
+    """
+    Upserts export rows over a DB-API connection in a few statements per
+    chunk instead of one round trip per journalist:
+
+    1. rows without an email that now have one adopt it, so the person
+       isn't stored twice;
+    2. rows with an email are inserted, or update the row with that email;
+    3. rows without one are inserted, or update the row with that name
+       and domain.
+
+    `dialect` is "sqlite" (sqlite3, the local stand-in) or "postgres"
+    (psycopg). The whole import is one transaction.
+    """
+
+    def __init__(self, conn, dialect="sqlite", chunk_rows=EXPORT_CHUNK_ROWS):
+        if dialect not in ("sqlite", "postgres"):
+            raise ValueError(f"Unknown dialect {dialect!r}")
+        self.conn = conn
+        self.dialect = dialect
+        self.chunk_rows = chunk_rows
+
+    def _placeholder(self, column=None):
+        mark = "?" if self.dialect == "sqlite" else "%s"
+        if self.dialect == "postgres" and column == "recent_articles":
+            return mark + "::jsonb"
+        return mark
+
+    def _value(self, row, column):
+        value = row[column]
+        if column == "recent_articles" or (column == "topics" and self.dialect == "sqlite"):
+            # psycopg adapts lists to text[]; jsonb and SQLite take JSON text
+            return json.dumps(value, separators=(",", ":"))
+        return value
+
+    def _upsert(self, cursor, rows, conflict):
+        row_marks = "(" + ", ".join(self._placeholder(column) for column in EXPORT_COLUMNS) + ")"
+        updates = ", ".join(f"{column} = excluded.{column}" for column in UPDATE_COLUMNS)
+        cursor.execute(
+            f"INSERT INTO journalists ({', '.join(EXPORT_COLUMNS)}) VALUES {', '.join([row_marks] * len(rows))} "
+            f"ON CONFLICT {conflict} DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP",
+            [self._value(row, column) for row in rows for column in EXPORT_COLUMNS],
+        )
+
+    def _adopt_emails(self, cursor, rows):
+        mark = self._placeholder()
+        columns = ("email",) + NAME_KEY
+        values = ", ".join([f"({', '.join([mark] * len(columns))})"] * len(rows))
+        if self.dialect == "sqlite":
+            # SQLite names VALUES columns column1..N and can't alias them
+            found = f"(VALUES {values}) AS found"
+            email, first_name, last_name, domain = (f"found.column{i}" for i in range(1, len(columns) + 1))
+        else:
+            found = f"(VALUES {values}) AS found ({', '.join(columns)})"
+            email, first_name, last_name, domain = (f"found.{column}" for column in columns)
+        cursor.execute(
+            f"UPDATE journalists SET email = {email}, updated_at = CURRENT_TIMESTAMP FROM {found} "
+            f"WHERE journalists.email IS NULL AND journalists.first_name = {first_name} "
+            f"AND journalists.last_name = {last_name} AND journalists.domain = {domain} "
+            f"AND NOT EXISTS (SELECT 1 FROM journalists AS taken WHERE taken.email = {email})",
+            [row[column] for row in rows for column in columns],
+        )
+        return max(cursor.rowcount, 0)
+
+    def import_rows(self, rows):
+        """Upsert `rows` (export_row dicts); returns counts of rows, statements and adopted emails"""
+        rows = unique_rows(rows)
+        stats = {"rows": len(rows), "statements": 0, "adopted_emails": 0}
+        cursor = self.conn.cursor()
+        try:
+            for chunk in chunked(rows, self.chunk_rows):
+                with_email = [row for row in chunk if row["email"]]
+                without_email = [row for row in chunk if not row["email"]]
+                if with_email:
+                    stats["adopted_emails"] += self._adopt_emails(cursor, with_email)
+                    self._upsert(cursor, with_email, "(email)")
+                    stats["statements"] += 2
+                if without_email:
+                    self._upsert(cursor, without_email, f"({', '.join(NAME_KEY)}) WHERE email IS NULL")
+                    stats["statements"] += 1
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        return stats
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def connect_sqlite(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SQLITE_SCHEMA)
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="upsert an NDJSON export into a journalists table")
+    importer.add_argument("path")
+    target = importer.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="local stand-in database file; the table is created if missing")
+    target.add_argument("--dsn", help="Postgres connection string")
+    importer.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    rows = [export_row(row) for row in read_ndjson(args.path)]
+    if args.sqlite:
+        conn, dialect = connect_sqlite(args.sqlite), "sqlite"
+    else:
+        try:
+            import psycopg
+        except ImportError:
+            sys.exit("Postgres import needs the psycopg package (pip install psycopg)")
+        conn, dialect = psycopg.connect(args.dsn), "postgres"
+    try:
+        stats = JournalistImporter(conn, dialect, args.chunk_rows).import_rows(rows)
+    finally:
+        conn.close()
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
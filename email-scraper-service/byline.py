@@ -0,0 +1,109 @@
+import os
+import re
+from functools import lru_cache
+
+BYLINE_CACHE_SIZE = int(os.getenv("BYLINE_CACHE_SIZE", 8192))
+
+WIRE_SERVICES = ("reuters", "associated press", "ap", "afp", "bloomberg news", "bloomberg")
+# Words of a byline that names a desk or wire service rather than a person,
+# e.g. "Staff", "Reuters Staff", "The Editorial Board", "AP"
+DESK_WORDS = frozenset(
+    "editorial staff team newsroom desk board writer writers reporter reporters editor editors "
+    "news wire service the of and".split()
+) | frozenset(word for service in WIRE_SERVICES for word in service.split())
+# A wire credit after a person's name: "Jane Doe for AFP", "John Smith, Reuters"
+WIRE_CREDIT = re.compile(
+    r'(?:\s+(?:for|with|via)\s+|\s*,\s*)(?:the\s+)?(?:' + '|'.join(re.escape(s) for s in WIRE_SERVICES) + r')\.?$',
+    re.IGNORECASE,
+)
+
+BY_PREFIX = re.compile(r'^\s*(?:written\s+)?by[:\s]+', re.IGNORECASE)
+# "Jane Doe | Reuters", "Jane Doe - The Verge", "Jane Doe — Staff Writer"
+OUTLET_SUFFIX = re.compile(r'\s+(?:\||[-–—]|/)\s+.*$')
+# RSS <author> is often "jane@example.com (Jane Doe)"
+EMAIL_WITH_NAME = re.compile(r'^\S+@\S+\s*\((?P<name>[^)]+)\)$')
+EMAIL = re.compile(r'\S+@\S+')
+PARENTHETICAL = re.compile(r'\s*\([^)]*\)')
+AND_SEPARATOR = re.compile(r'\s+and\s+|\s*&\s*', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+HONORIFICS = {"dr", "mr", "mrs", "ms", "mx", "prof", "professor", "sir", "dame", "rev", "hon"}
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "phd", "md", "mba", "esq"}
+
+
+def _bare(word):
+    return word.rstrip('.,').lower()
+
+
+def _is_desk(name):
+    return all(_bare(word) in DESK_WORDS for word in name.split())
+
+
+@lru_cache(maxsize=BYLINE_CACHE_SIZE)
+def clean_byline(value):
+    """Strip "By", outlet suffixes, wire credits, emails and parentheticals from a raw byline"""
+    value = value.strip()
+    match = EMAIL_WITH_NAME.match(value)
+    if match:
+        value = match.group("name")
+    value = BY_PREFIX.sub('', value)
+    value = OUTLET_SUFFIX.sub('', value)
+    value = EMAIL.sub('', value)
+    value = PARENTHETICAL.sub('', value)
+    value = WHITESPACE.sub(' ', value).strip(' ,')
+    return WIRE_CREDIT.sub('', value).strip(' ,')
+
+
+def extract_author(entry, author_fields):
+    for field in author_fields:
+        value = entry.get(field)
+        if value:
+            return clean_byline(value)
+    return ""
+
+
+def _split_name(name):
+    words = [word for word in name.split() if _bare(word) not in HONORIFICS]
+    while words and _bare(words[-1]) in NAME_SUFFIXES:
+        words.pop()
+    if not words:
+        return None
+    return words[0], " ".join(words[1:])
+
+
+@lru_cache(maxsize=BYLINE_CACHE_SIZE)
+def parse_name(full_name):
+    """
+    Parse a byline into a tuple of (first_name, last_name) pairs.
+    Handles multiple authors separated by 'and', '&' or commas, e.g.
+    "By Jane Doe, John Roe and Dr. Ann Poe | Reuters". Wire credits are
+    dropped ("Jane Doe for AFP"), and names made only of desk or wire
+    words ("Staff", "Reuters", "The Editorial Board") are skipped.
+    """
+    if not full_name:
+        return ()
+
+    full_name = clean_byline(full_name)
+    author_names = AND_SEPARATOR.split(full_name)
+
+    # "A B, C D and E F" lists several people; "Smith, Jones" (single words
+    # only) is a surname list or "Last, First" and can't be split reliably
+    expanded_names = []
+    for name in author_names:
+        if ',' in name:
+            parts = [p.strip() for p in name.split(',')]
+            parts = [p for p in parts if p and _bare(p) not in NAME_SUFFIXES]
+            if len(parts) > 1 and all(len(p.split()) == 1 for p in parts):
+                continue
+            expanded_names.extend(parts)
+        else:
+            expanded_names.append(name)
+
+    results = []
+    for name in expanded_names:
+        if not name.strip() or _is_desk(name):
+            continue
+        parsed = _split_name(name)
+        if parsed and parsed not in results:
+            results.append(parsed)
+    return tuple(results)
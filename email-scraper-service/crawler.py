@@ -0,0 +1,254 @@
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import List
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+USER_AGENT = os.getenv("CRAWLER_USER_AGENT", "PROutreachBot/1.0 (+https://github.com/Swastik-Raj/PR_Outreach_Web_App)")
+CRAWL_TIMEOUT = float(os.getenv("CRAWLER_TIMEOUT", 10))
+# Politeness: concurrent requests and minimum spacing per host
+CRAWL_PER_HOST = int(os.getenv("CRAWLER_PER_HOST", 2))
+CRAWL_DELAY = float(os.getenv("CRAWLER_DELAY", 1.0))
+CRAWL_CONCURRENCY = int(os.getenv("CRAWLER_CONCURRENCY", 16))
+# Stop reading a page after this many bytes
+CRAWL_MAX_BYTES = int(os.getenv("CRAWLER_MAX_BYTES", 1024 * 1024))
+ROBOTS_TTL = float(os.getenv("CRAWLER_ROBOTS_TTL", 6 * 60 * 60))
+ROBOTS_MAX_BYTES = 512 * 1024
+# What a bad link or a misbehaving site can raise: transport errors, URLs
+# httpx refuses, and urlsplit's ValueError (e.g. "http://[::1/a")
+FETCH_ERRORS = (httpx.HTTPError, httpx.InvalidURL, httpx.StreamError, ValueError)
+
+# Bounded repeats keep long runs of letters (inline images, minified JS) linear to scan
+EMAIL_REGEX = re.compile(rb"[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9.-]{1,253}\.[a-zA-Z]{2,24}")
+# Longest address we need to carry across a chunk boundary (RFC 5321 limit)
+MAX_EMAIL_LENGTH = 254
+EMAIL_CHARS = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+# File names like logo@2x.png look like addresses
+NOT_EMAIL_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js")
+
+LINK_PATTERN = re.compile(r'<a\s([^>]*?)href\s*=\s*["\']([^"\'#]+)["\']([^>]*)>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+@dataclass
+class Page:
+    url: str
+    status: int
+    html: str = ""
+    emails: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+
+@dataclass
+class Link:
+    url: str
+    text: str
+    rel: str
+
+
+class EmailScanner:
+    """Finds addresses in a byte stream chunk by chunk, catching ones split across chunks"""
+
+    def __init__(self):
+        self.emails = []
+        self._seen = set()
+        self._tail = b""
+
+    def feed(self, chunk):
+        data = self._tail + chunk
+        keep_from = max(0, len(data) - MAX_EMAIL_LENGTH)
+        matches = EMAIL_REGEX.finditer(data) if b"@" in data else ()
+        for match in matches:
+            if match.end() == len(data) or match.start() >= keep_from:
+                # May continue in the next chunk; rescan it together with that
+                keep_from = min(keep_from, match.start())
+                break
+            self._add(match.group())
+            keep_from = max(keep_from, match.end())
+        # Don't cut a local part in half whose "@" hasn't arrived yet
+        floor = max(0, keep_from - MAX_EMAIL_LENGTH)
+        while keep_from > floor and data[keep_from - 1] in EMAIL_CHARS:
+            keep_from -= 1
+        self._tail = data[keep_from:]
+
+    def close(self):
+        for match in EMAIL_REGEX.finditer(self._tail):
+            self._add(match.group())
+        self._tail = b""
+        return self.emails
+
+    def _add(self, raw):
+        email = raw.decode("ascii", "ignore").strip(".").lower()
+        if email in self._seen or email.endswith(NOT_EMAIL_SUFFIXES):
+            return
+        self._seen.add(email)
+        self.emails.append(email)
+
+
+def extract_links(page):
+    """Anchors on a page as absolute URLs, with their text and rel attribute"""
+    links = []
+    for before, href, after, text in LINK_PATTERN.findall(page.html):
+        if href.startswith(("mailto:", "javascript:", "tel:")):
+            continue
+        try:
+            url = urljoin(page.url, href.strip())
+        except ValueError:
+            continue
+        rel = re.search(r'rel\s*=\s*["\']([^"\']+)["\']', before + after, re.IGNORECASE)
+        links.append(Link(
+            url=url,
+            text=" ".join(TAG_PATTERN.sub(" ", text).split()),
+            rel=rel.group(1).lower() if rel else "",
+        ))
+    return links
+
+
+class Crawler:
+    """
+    Bounded, polite async page fetcher.
+
+    Requests are capped globally and per host, spaced `delay` seconds apart
+    per host (or the site's robots.txt Crawl-delay), checked against a
+    cached robots.txt, and read only up to `max_bytes`. Pass an existing
+    httpx.AsyncClient to share its connection pool; otherwise the crawler
+    owns one and `aclose()` releases it.
+    """
+
+    def __init__(self, client=None, per_host=CRAWL_PER_HOST, delay=CRAWL_DELAY, concurrency=CRAWL_CONCURRENCY,
+                 max_bytes=CRAWL_MAX_BYTES, robots_ttl=ROBOTS_TTL, timeout=CRAWL_TIMEOUT, user_agent=USER_AGENT):
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self.per_host = per_host
+        self.delay = delay
+        self.max_bytes = max_bytes
+        self.robots_ttl = robots_ttl
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._host_slots = {}
+        self._host_locks = {}
+        self._next_request = {}
+        self._robots = {}
+        self.stats = {"pages": 0, "robots_denied": 0, "truncated": 0, "errors": 0}
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _host_lock(self, host):
+        if host not in self._host_locks:
+            self._host_locks[host] = asyncio.Lock()
+        return self._host_locks[host]
+
+    async def _robots_for(self, origin):
+        cached = self._robots.get(origin)
+        if cached is not None and time.monotonic() - cached[1] < self.robots_ttl:
+            return cached[0]
+
+        async with self._host_lock(f"robots:{origin}"):
+            cached = self._robots.get(origin)
+            if cached is not None and time.monotonic() - cached[1] < self.robots_ttl:
+                return cached[0]
+
+            robots = RobotFileParser()
+            try:
+                async with self._polite(origin):
+                    status, body, _ = await self._get(f"{origin}/robots.txt", ROBOTS_MAX_BYTES)
+                if status >= 500:
+                    # Server trouble: treat the whole site as off limits for now
+                    robots.disallow_all = True
+                elif status >= 400:
+                    robots.allow_all = True
+                else:
+                    robots.parse(body.decode("utf-8", "ignore").splitlines())
+            except FETCH_ERRORS:
+                robots.disallow_all = True
+            self._robots[origin] = (robots, time.monotonic())
+            return robots
+
+    async def allowed(self, url):
+        parts = urlsplit(url)
+        robots = await self._robots_for(f"{parts.scheme}://{parts.netloc}")
+        return robots.can_fetch(self.user_agent, url)
+
+    def _crawl_delay(self, origin):
+        cached = self._robots.get(origin)
+        if cached is not None:
+            delay = cached[0].crawl_delay(self.user_agent)
+            if delay:
+                return max(self.delay, float(delay))
+        return self.delay
+
+    @asynccontextmanager
+    async def _polite(self, origin):
+        """Hold a global and a per-host slot, waiting out the host's crawl delay first"""
+        if origin not in self._host_slots:
+            self._host_slots[origin] = asyncio.Semaphore(max(1, self.per_host))
+        async with self._slots, self._host_slots[origin]:
+            async with self._host_lock(origin):
+                wait = self._next_request.get(origin, 0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_request[origin] = time.monotonic() + self._crawl_delay(origin)
+            yield
+
+    async def _get(self, url, max_bytes, scanner=None):
+        """GET with a size cap; returns (status, body, truncated)"""
+        chunks = []
+        size = 0
+        truncated = False
+        headers = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"}
+        async with self.client.stream("GET", url, headers=headers, follow_redirects=True,
+                                      timeout=self.timeout) as response:
+            if response.status_code >= 400:
+                return response.status_code, b"", False
+            async for chunk in response.aiter_bytes():
+                if size + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - size]
+                    truncated = True
+                size += len(chunk)
+                chunks.append(chunk)
+                if scanner is not None:
+                    scanner.feed(chunk)
+                if truncated:
+                    break
+            return response.status_code, b"".join(chunks), truncated
+
+    async def fetch(self, url):
+        """
+        Fetch one page, scanning it for email addresses as it streams in.
+        Returns None when robots.txt forbids the URL or the request fails.
+        """
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            self.stats["errors"] += 1
+            return None
+        if parts.scheme not in ("http", "https"):
+            return None
+        if not await self.allowed(url):
+            self.stats["robots_denied"] += 1
+            return None
+
+        scanner = EmailScanner()
+        try:
+            async with self._polite(f"{parts.scheme}://{parts.netloc}"):
+                status, body, truncated = await self._get(url, self.max_bytes, scanner)
+        except FETCH_ERRORS:
+            self.stats["errors"] += 1
+            return None
+
+        self.stats["pages"] += 1
+        self.stats["truncated"] += truncated
+        return Page(url=url, status=status, html=body.decode("utf-8", "ignore"),
+                    emails=scanner.close(), truncated=truncated)
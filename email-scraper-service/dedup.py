@@ -0,0 +1,224 @@
+import hashlib
+import os
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# Articles whose shingle sets overlap at least this much (Jaccard) are the same story
+DEDUP_MIN_SIMILARITY = float(os.getenv("DEDUP_MIN_SIMILARITY", 0.7))
+# Articles with fewer terms than this are too short to compare reliably
+MINHASH_MIN_TERMS = 6
+# 16 LSH bands of 4 MinHash rows: pairs above ~0.5 similarity become candidates,
+# and a 0.7 pair is missed with probability ~1%
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+BAND_BYTES = 8
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "cmpid", "ref", "src", "smid", "taid", "ocid", "guccounter"}
+
+# Each MinHash permutation is x -> (x ^ salt) * odd multiplier mod 2**64, a bijection
+_rng = np.random.default_rng(20240607)
+SALTS = _rng.integers(0, 2 ** 63, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+MULTIPLIERS = _rng.integers(0, 2 ** 63, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+ROW_MULTIPLIERS = _rng.integers(0, 2 ** 63, MINHASH_ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def canonical_url(url):
+    """
+    The same article's URL as feeds spell it differently: lowercase host
+    without "www.", no fragment, tracking parameters or trailing slash, the
+    remaining query sorted, and AMP variants folded into the main page.
+    A link urlsplit rejects (e.g. "http://[::1/a") is kept as written.
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("amp."):
+        host = host[4:]
+    path = parts.path
+    for suffix in ("/amp", "/amp/", ".amp"):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    path = path.rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def shingles(terms):
+    """
+    Adjacent term pairs of an article's ordered terms. Copies of a story
+    share nearly all of them, while unrelated articles on the same topic
+    share vocabulary but rarely its order.
+    """
+    return {f"{a} {b}" for a, b in zip(terms, terms[1:])}
+
+
+@lru_cache(maxsize=65536)
+def shingle_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+
+
+def signatures(term_lists):
+    """
+    LSH band signature of each term list as bytes (MINHASH_BANDS digests
+    of BAND_BYTES each), or b"" for lists too short to compare. All lists
+    are min-hashed together in one vectorized pass.
+    """
+    result = [b""] * len(term_lists)
+    eligible = [(i, shingles(terms)) for i, terms in enumerate(term_lists) if len(terms) >= MINHASH_MIN_TERMS]
+    if not eligible:
+        return result
+
+    counts = np.array([len(pairs) for _, pairs in eligible])
+    hashes = np.fromiter((shingle_hash(s) for _, pairs in eligible for s in pairs), dtype=np.uint64, count=counts.sum())
+    permuted = (hashes[:, None] ^ SALTS) * MULTIPLIERS
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    minhashes = np.minimum.reduceat(permuted, offsets, axis=0)
+    # Fold each band's rows into one 64-bit digest
+    bands = (minhashes.reshape(len(eligible), MINHASH_BANDS, MINHASH_ROWS) * ROW_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    for row, (i, _) in enumerate(eligible):
+        result[i] = bands[row].tobytes()
+    return result
+
+
+def fingerprint_articles(articles):
+    """Set url_key and signature on a freshly parsed feed's articles"""
+    for article, signature in zip(articles, signatures([article.terms for article in articles])):
+        article.url_key = canonical_url(article.link)
+        article.signature = signature
+    return articles
+
+
+def similarity(a, b):
+    """Jaccard similarity of two articles' shingle sets"""
+    a, b = shingles(a.terms), shingles(b.terms)
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class _Clusters:
+    """Union-find; the smallest member represents each set"""
+
+    def __init__(self, items=()):
+        self.parent = {item: item for item in items}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def cluster_articles(articles):
+    """
+    Group positions of articles that are the same story: equal canonical
+    URL, or shingle sets at least DEDUP_MIN_SIMILARITY alike. Candidate pairs
+    come from shared LSH bands, so this stays near-linear. Returns a list
+    of clusters, each a list of positions in input order.
+    """
+    clusters = _Clusters(range(len(articles)))
+    by_url = {}
+    buckets = {}
+    for position, article in enumerate(articles):
+        if article.url_key:
+            first = by_url.setdefault(article.url_key, position)
+            if first != position:
+                clusters.union(first, position)
+        signature = article.signature
+        for start in range(0, len(signature), BAND_BYTES):
+            band = (start, signature[start:start + BAND_BYTES])
+            for other in buckets.get(band, ()):
+                if clusters.find(other) != clusters.find(position) and \
+                        similarity(articles[other], article) >= DEDUP_MIN_SIMILARITY:
+                    clusters.union(other, position)
+            buckets.setdefault(band, []).append(position)
+
+    grouped = {}
+    for position in range(len(articles)):
+        grouped.setdefault(clusters.find(position), []).append(position)
+    return list(grouped.values())
+
+
+def dedupe_journalists(journalists):
+    """
+    Collapse syndicated coverage in a query's journalist index, in place.
+
+    Near-duplicate articles are clustered across every journalist. When
+    the same byline appears on one story at several outlets, the outlet
+    that published it first keeps the journalist and the others are folded
+    into it (their publication names land in `syndicated_in`), so each
+    person is enriched once, at the originating outlet. Duplicate copies
+    of a story under one journalist are dropped, keeping the earliest.
+    Returns a stats dict.
+    """
+    stats = {"duplicate_articles": 0, "merged_journalists": 0}
+    owners = []
+    articles = []
+    for key, journalist in journalists.items():
+        for article in journalist.articles:
+            owners.append(key)
+            articles.append(article)
+    if len(articles) < 2:
+        return stats
+
+    # Link journalist keys whose byline is on the same story at different outlets
+    people = _Clusters()
+    first_seen = {}
+    for cluster in cluster_articles(articles):
+        by_name = {}
+        for position in cluster:
+            journalist = journalists[owners[position]]
+            name = (journalist.first_name.lower(), journalist.last_name.lower())
+            if name in by_name:
+                people.union(by_name[name], owners[position])
+            else:
+                by_name[name] = owners[position]
+            # Earliest byline per outlet decides who published first
+            stamp = (articles[position].timestamp, position)
+            first_seen[owners[position]] = min(first_seen.get(owners[position], stamp), stamp)
+
+    linked = {}
+    for key in list(journalists):
+        linked.setdefault(people.find(key), []).append(key)
+    for keys in linked.values():
+        if len(keys) < 2:
+            continue
+        origin = min(keys, key=lambda key: first_seen[key])
+        target = journalists[origin]
+        for key in keys:
+            if key == origin:
+                continue
+            duplicate = journalists.pop(key)
+            target.topics.update(duplicate.topics)
+            target.articles.extend(duplicate.articles)
+            target.syndicated_in.add(duplicate.publication_name)
+            stats["merged_journalists"] += 1
+
+    for journalist in journalists.values():
+        if len(journalist.articles) < 2:
+            continue
+        kept = []
+        ordered = sorted(journalist.articles, key=lambda article: article.timestamp)
+        for cluster in cluster_articles(ordered):
+            kept.append(ordered[cluster[0]])
+        stats["duplicate_articles"] += len(journalist.articles) - len(kept)
+        # Back to feed order (newest first within a feed)
+        order = {id(article): position for position, article in enumerate(journalist.articles)}
+        journalist.articles = sorted(kept, key=lambda article: order[id(article)])
+    return stats
+
@@ -0,0 +1,105 @@
+import asyncio
+import re
+import unicodedata
+from urllib.parse import urljoin, urlsplit
+
+from crawler import extract_links
+
+# Links that usually lead to a journalist's profile page
+AUTHOR_PATH = re.compile(r'/(author|authors|by|people|staff|profile|profiles|contributor|contributors|writer|writers|journalist|journalists)/', re.IGNORECASE)
+CONTACT_PATH = re.compile(r'/(contact|contact-us|about|about-us|masthead|staff|team)(/|\.html?)?$', re.IGNORECASE)
+CONTACT_FALLBACKS = ("/contact", "/about")
+MAX_AUTHOR_PAGES = 2
+MAX_CONTACT_PAGES = 2
+
+NON_LETTERS = re.compile(r'[^a-z]')
+
+
+def _name_part(value):
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return NON_LETTERS.sub("", value.lower())
+
+
+def _site(value):
+    value = (value or "").lower()
+    return value[4:] if value.startswith("www.") else value
+
+
+def belongs_to(email, first_name, last_name, domain=None):
+    """
+    True when the address is at `domain` (or a subdomain) and its local
+    part is built from the person's name, so desk and tips addresses on
+    the same page aren't mistaken for the journalist's.
+    """
+    local, _, host = email.lower().rpartition("@")
+    if domain:
+        domain = _site(domain)
+        if _site(host) != domain and not host.endswith("." + domain):
+            return False
+    first, last = _name_part(first_name), _name_part(last_name)
+    if not last:
+        return bool(first) and _name_part(local) == first
+    local = _name_part(local)
+    return last in local and (not first or first[0] in local.replace(last, "", 1) or local.startswith(first))
+
+
+def _pick(emails, first_name, last_name, domain):
+    for email in emails:
+        if belongs_to(email, first_name, last_name, domain):
+            return email
+    return None
+
+
+def _author_links(page, last_name):
+    last = _name_part(last_name)
+    candidates = []
+    for link in extract_links(page):
+        if "author" in link.rel.split() or AUTHOR_PATH.search(urlsplit(link.url).path):
+            named = bool(last) and last in _name_part(link.text + link.url)
+            candidates.append((not named, "author" not in link.rel.split(), link.url))
+    seen = []
+    for _, _, url in sorted(candidates):
+        if url not in seen and url != page.url:
+            seen.append(url)
+    return seen[:MAX_AUTHOR_PAGES]
+
+
+def _contact_links(page):
+    root = "{0.scheme}://{0.netloc}".format(urlsplit(page.url))
+    urls = []
+    for link in extract_links(page):
+        parts = urlsplit(link.url)
+        if f"{parts.scheme}://{parts.netloc}" == root and CONTACT_PATH.search(parts.path):
+            urls.append(link.url)
+    urls.extend(urljoin(root, path) for path in CONTACT_FALLBACKS)
+    return list(dict.fromkeys(urls))[:MAX_CONTACT_PAGES]
+
+
+async def discover_email(article_url, first_name, last_name, crawler, domain=None):
+    """
+    Look for the journalist's address the way a person would: the article
+    itself, then their author page(s), then the site's contact/about
+    pages. Returns the first address that belongs to them, or None.
+    """
+    page = await crawler.fetch(article_url)
+    if page is None:
+        return None
+    email = _pick(page.emails, first_name, last_name, domain)
+    if email:
+        return email
+
+    author_pages = await asyncio.gather(*(crawler.fetch(url) for url in _author_links(page, last_name)))
+    for author_page in author_pages:
+        if author_page is not None:
+            email = _pick(author_page.emails, first_name, last_name, domain)
+            if email:
+                return email
+
+    for url in _contact_links(page):
+        contact_page = await crawler.fetch(url)
+        if contact_page is not None:
+            email = _pick(contact_page.emails, first_name, last_name, domain)
+            if email:
+                return email
+    return None
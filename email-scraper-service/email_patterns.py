@@ -0,0 +1,182 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+
+from hunter_cache import CACHE_DIR
+from metrics import CACHE_EVENTS
+
+EMAIL_PATTERNS_PATH = os.getenv("EMAIL_PATTERNS_PATH", str(CACHE_DIR / "email_patterns.sqlite3"))
+# A domain's pattern is only trusted after this many verified addresses...
+PATTERN_MIN_SAMPLES = int(os.getenv("EMAIL_PATTERN_MIN_SAMPLES", 3))
+# ...and when this share of them (smoothed, see EmailPatterns.infer) follow it
+PATTERN_MIN_CONFIDENCE = float(os.getenv("EMAIL_PATTERN_MIN_CONFIDENCE", 0.75))
+
+NON_LETTERS = re.compile(r'[^a-z]')
+
+# Local-part formats seen at publishers, from most to least common
+PATTERNS = {
+    "first.last": lambda f, l: f"{f}.{l}",
+    "flast": lambda f, l: f"{f[0]}{l}",
+    "firstlast": lambda f, l: f"{f}{l}",
+    "first": lambda f, l: f,
+    "first_last": lambda f, l: f"{f}_{l}",
+    "first-last": lambda f, l: f"{f}-{l}",
+    "f.last": lambda f, l: f"{f[0]}.{l}",
+    "firstl": lambda f, l: f"{f}{l[0]}",
+    "last.first": lambda f, l: f"{l}.{f}",
+    "lastf": lambda f, l: f"{l}{f[0]}",
+    "last": lambda f, l: l,
+}
+
+
+def _name_part(value):
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return NON_LETTERS.sub("", value.lower())
+
+
+def _domain(value):
+    value = (value or "").strip().lower()
+    return value[4:] if value.startswith("www.") else value
+
+
+def render(pattern, first_name, last_name, domain):
+    first, last = _name_part(first_name), _name_part(last_name)
+    if not first or not last:
+        return None
+    return f"{PATTERNS[pattern](first, last)}@{_domain(domain)}"
+
+
+def matching_patterns(first_name, last_name, email):
+    """Every known pattern that renders this person's name to the email's local part"""
+    first, last = _name_part(first_name), _name_part(last_name)
+    if not first or not last or "@" not in email:
+        return []
+    local = email.rsplit("@", 1)[0].lower()
+    return [name for name, build in PATTERNS.items() if build(first, last) == local]
+
+
+class EmailPatterns:
+    """
+    Learns each domain's dominant email format from verified addresses and
+    synthesizes addresses for new journalists at domains whose format is
+    known with enough confidence. Counts persist in SQLite.
+    """
+
+    def __init__(self, path=EMAIL_PATTERNS_PATH, min_samples=PATTERN_MIN_SAMPLES,
+                 min_confidence=PATTERN_MIN_CONFIDENCE):
+        self.min_samples = min_samples
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS email_pattern_samples (
+                domain TEXT NOT NULL,
+                email TEXT NOT NULL,
+                PRIMARY KEY (domain, email)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS email_patterns (
+                domain TEXT NOT NULL,
+                pattern TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (domain, pattern)
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM email_pattern_samples LIMIT 1").fetchone() is None
+
+    def learn(self, first_name, last_name, domain, email):
+        """Record one verified address. Each address counts once per domain."""
+        domain, email = _domain(domain), email.lower()
+        if _domain(email.rsplit("@", 1)[-1]) != domain:
+            # Hunter sometimes answers with an address at a sister domain
+            return
+        patterns = matching_patterns(first_name, last_name, email)
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO email_pattern_samples (domain, email) VALUES (?, ?)", (domain, email)
+            ).rowcount
+            if not inserted:
+                return
+            self._conn.executemany(
+                "INSERT INTO email_patterns (domain, pattern, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (domain, pattern) DO UPDATE SET count = count + 1",
+                [(domain, pattern) for pattern in patterns]
+            )
+
+    def bootstrap(self, found):
+        """Seed an empty store from (first, last, domain, email) tuples, e.g. the Hunter cache"""
+        if not self.is_empty():
+            return
+        for first_name, last_name, domain, email in found:
+            self.learn(first_name, last_name, domain, email)
+
+    def infer(self, domain):
+        """
+        The domain's dominant pattern and its confidence, or (None, 0.0).
+        Confidence is count / (samples + 1), so a handful of agreeing
+        samples never reads as certainty.
+        """
+        domain = _domain(domain)
+        with self._lock:
+            samples, = self._conn.execute(
+                "SELECT COUNT(*) FROM email_pattern_samples WHERE domain = ?", (domain,)
+            ).fetchone()
+            if samples < self.min_samples:
+                return None, 0.0
+            row = self._conn.execute(
+                "SELECT pattern, count FROM email_patterns WHERE domain = ? ORDER BY count DESC LIMIT 1", (domain,)
+            ).fetchone()
+        if row is None:
+            return None, 0.0
+        return row[0], row[1] / (samples + 1)
+
+    def synthesize(self, first_name, last_name, domain):
+        """
+        (email, score, "pattern") built from the domain's pattern, or None
+        when the pattern isn't trusted and Hunter should be asked instead.
+        """
+        pattern, confidence = self.infer(domain)
+        email = render(pattern, first_name, last_name, domain) if pattern else None
+        if email is None or confidence < self.min_confidence:
+            self.misses += 1
+            CACHE_EVENTS.labels("email_pattern", "miss").inc()
+            return None
+        self.hits += 1
+        CACHE_EVENTS.labels("email_pattern", "hit").inc()
+        return email, round(confidence * 100), "pattern"
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            domains = self._conn.execute(
+                "SELECT domain, COUNT(*) FROM email_pattern_samples GROUP BY domain"
+            ).fetchall()
+        confident = sum(1 for domain, _ in domains if self.infer(domain)[1] >= self.min_confidence)
+        lookups = self.hits + self.misses
+        return {
+            "domains": len(domains),
+            "confident_domains": confident,
+            "synthesized": self.hits,
+            "deferred_to_hunter": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
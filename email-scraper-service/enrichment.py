@@ -0,0 +1,248 @@
+import asyncio
+import os
+import time
+import transport
+from fastapi.concurrency import run_in_threadpool
+from hunter_cache import cache_key, get_hunter_cache
+from email_patterns import EmailPatterns
+from journalist_store import get_journalist_store
+from singleflight import AsyncSingleFlight
+from metrics import ENRICHMENT_RESULTS, ERRORS, HUNTER_REQUEST_SECONDS, cache_ratios, stage_timer
+from web_discovery import WEB_DISCOVERY_ENABLED, Crawler, find_email_on_web
+
+HUNTER_EMAIL_FINDER_URL = os.getenv("HUNTER_EMAIL_FINDER_URL", "https://api.hunter.io/v2/email-finder")
+HUNTER_TIMEOUT = 5
+# Hunter allows 15 email-finder requests per second per API key
+HUNTER_RATE_LIMIT = float(os.getenv("HUNTER_RATE_LIMIT", 15))
+HUNTER_CONCURRENCY = int(os.getenv("HUNTER_CONCURRENCY", 10))
+MIN_CONFIDENCE = 70
+
+_bucket = None
+_patterns = None
+_crawler = None
+hunter_flight = AsyncSingleFlight("hunter")
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def get_rate_limiter():
+    # The quota is per API key, so every request shares one bucket
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket(HUNTER_RATE_LIMIT)
+    return _bucket
+
+
+def get_email_patterns():
+    """Domain email-pattern store, seeded from verified Hunter results already cached"""
+    global _patterns
+    if _patterns is None:
+        _patterns = EmailPatterns()
+        _patterns.bootstrap(get_hunter_cache().found(MIN_CONFIDENCE))
+        cache_ratios.register("email_pattern", _patterns.hit_ratio)
+    return _patterns
+
+
+def get_crawler():
+    """Polite publisher-site crawler for web discovery, sharing the client's pool"""
+    global _crawler
+    if _crawler is None:
+        _crawler = Crawler(client=transport.get_async_client())
+    return _crawler
+
+
+async def close_client():
+    global _crawler
+    _crawler = None
+    await transport.aclose()
+
+
+async def find_email_with_hunter(first_name, last_name, domain, api_key, article_urls=()):
+    cache = get_hunter_cache()
+    cached = cache.get(first_name, last_name, domain)
+    if cached is not None:
+        print(f"  [{first_name} {last_name}] Cached Hunter result @ {domain}: {cached[0] or 'not found'}")
+        return cached
+
+    # Most publications use one address format; once it's known, skip the paid lookup
+    synthesized = get_email_patterns().synthesize(first_name, last_name, domain)
+    if synthesized is not None:
+        print(f"  [{first_name} {last_name}] Synthesized from domain pattern: {synthesized[0]}")
+        return synthesized
+
+    # Concurrent scrapes asking for the same person share one lookup
+    key = cache_key(first_name, last_name, domain)
+    return await hunter_flight.do(key, _lookup_and_cache, first_name, last_name, domain, api_key, article_urls)
+
+
+async def _lookup_and_cache(first_name, last_name, domain, api_key, article_urls=()):
+    if WEB_DISCOVERY_ENABLED and article_urls:
+        found = await find_email_on_web(first_name, last_name, domain, article_urls, get_crawler())
+        if found is not None:
+            print(f"  [{first_name} {last_name}] Found on the web: {found[0]}")
+            # Only hits are cached; a miss here still deserves a Hunter lookup
+            get_hunter_cache().set(first_name, last_name, domain, *found)
+            return found
+
+    result = await _lookup_hunter(first_name, last_name, domain, api_key)
+    get_hunter_cache().set(first_name, last_name, domain, *result)
+    email, score, source = result
+    if email and source == "hunter" and score >= MIN_CONFIDENCE:
+        get_email_patterns().learn(first_name, last_name, domain, email)
+    return result
+
+
+async def _lookup_hunter(first_name, last_name, domain, api_key):
+    if not api_key:
+        print(f" HUNTER_API_KEY missing for {first_name} {last_name}")
+        return None, 0, "missing_api_key"
+
+    params = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "domain": domain,
+        "api_key": api_key
+    }
+
+    try:
+        print(f"  [{first_name} {last_name}] Searching Hunter @ {domain}")
+        started = time.perf_counter()
+        # Every attempt, retries included, spends a token from the per-key quota
+        res = await transport.aget(HUNTER_EMAIL_FINDER_URL, params=params, timeout=HUNTER_TIMEOUT,
+                                   before_attempt=get_rate_limiter().acquire)
+        HUNTER_REQUEST_SECONDS.labels(str(res.status_code)).observe(time.perf_counter() - started)
+
+        data = res.json()
+
+        if not res.is_success:
+            print(f"Hunter API error: {data}")
+            ERRORS.labels("enrichment", "api_error").inc()
+            return None, 0, "api_error"
+
+        if data.get("data") and data["data"].get("email"):
+            email = data["data"]["email"]
+            score = data["data"].get("score", 0)
+            print(f"    ✓ Found: {email} (score: {score})")
+            return (email, score, "hunter")
+        else:
+            print(f"    ✗ Not found")
+    except Exception as e:
+        print(f"Hunter error for {first_name} {last_name}: {e}")
+        ERRORS.labels("enrichment", type(e).__name__).inc()
+        return None, 0, "error"
+
+    return None, 0, "not_found"
+
+
+async def enrich_journalist(j, api_key):
+    """
+    Resolve an email for a single journalist, setting it on `j` in place.
+    Returns the journalist and the stats bucket it falls into. Callers
+    save results with (a)record_enrichments, in batches.
+    """
+    email, confidence, source, bucket = await _resolve_email(j, api_key)
+    j.set_email(email, confidence, source)
+    ENRICHMENT_RESULTS.labels(bucket).inc()
+    return j, bucket
+
+
+def record_enrichments(journalists):
+    """Save enrichment results to the journalist store; blocking, so call it off the event loop"""
+    try:
+        get_journalist_store().record_enrichments(journalists)
+    except Exception as e:
+        ERRORS.labels("journalist_store", type(e).__name__).inc()
+
+
+async def arecord_enrichments(journalists):
+    """
+    record_enrichments in the threadpool: the store's lock is shared with
+    ingestion, which can hold it for a whole feed poll.
+    """
+    journalists = list(journalists)
+    if journalists:
+        await run_in_threadpool(record_enrichments, journalists)
+
+
+async def _resolve_email(j, api_key):
+    # Skip Hunter if no real author name
+    if not j.first_name or not j.last_name:
+        return f"editor@{j.domain}", 0, "fallback", "fallback"
+
+    email, confidence, source = await find_email_with_hunter(
+        j.first_name,
+        j.last_name,
+        j.domain,
+        api_key,
+        [article.link for article in j.articles if article.link]
+    )
+
+    # Reject low-confidence emails
+    if not email or confidence < MIN_CONFIDENCE:
+        bucket = "not_found" if confidence == 0 else "low_confidence"
+        return f"editor@{j.domain}", confidence, "low_confidence", bucket
+
+    return email, confidence, source, "verified"
+
+
+async def enrich_journalists(journalists, api_key, concurrency=HUNTER_CONCURRENCY):
+    """
+    Enrich journalists concurrently, at most `concurrency` lookups in flight.
+    Returns the enriched list (in input order) and a stats dict.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stats = {"verified": 0, "low_confidence": 0, "fallback": 0, "not_found": 0}
+
+    async def worker(j):
+        async with semaphore:
+            return await enrich_journalist(j, api_key)
+
+    with stage_timer("enrichment", journalists=len(journalists)):
+        results = await asyncio.gather(*(worker(j) for j in journalists))
+    await arecord_enrichments(journalist for journalist, _ in results)
+
+    enriched = []
+    for journalist, bucket in results:
+        enriched.append(journalist)
+        stats[bucket] += 1
+    return enriched, stats
+
+
+async def enrich_query_results(result_lists, api_key, concurrency=HUNTER_CONCURRENCY):
+    """
+    Enrich several journalist lists, looking up each unique journalist once.
+    Returns the enriched lists (same shape as the input) and a stats dict
+    over the unique journalists.
+    """
+    unique = {}
+    for journalists in result_lists:
+        for j in journalists:
+            unique.setdefault(j.key, j)
+
+    _, stats = await enrich_journalists(list(unique.values()), api_key, concurrency)
+    for journalists in result_lists:
+        for j in journalists:
+            if j is not unique[j.key]:
+                j.copy_email(unique[j.key])
+
+    return result_lists, stats
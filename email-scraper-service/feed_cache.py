@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import CACHE_EVENTS, cache_ratios
+
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", 1000))
+
+
+class FeedCache:
+    """
+    In-memory cache of RSS responses keyed by feed URL.
+
+    Each entry keeps the body's digest, the articles parsed from it and
+    the ETag/Last-Modified validators so the next fetch can be conditional.
+    Neither the raw body nor the feedparser result is retained.
+    """
+
+    def __init__(self, max_entries=FEED_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"not_modified": 0, "unchanged": 0, "parsed": 0}
+        # stats() of the feed caches in scrape worker processes, by shard
+        self._reported = {}
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def conditional_headers(self, url):
+        """Request headers that let the server answer 304 Not Modified"""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, body, articles, etag=None, last_modified=None):
+        entry = {
+            "digest": digest(body),
+            "articles": articles,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def revalidate(self, url, etag=None, last_modified=None):
+        """Refresh validators and fetch time of an entry whose content hasn't changed"""
+        with self._lock:
+            entry = self._entries[url]
+            entry["etag"] = etag or entry["etag"]
+            entry["last_modified"] = last_modified or entry["last_modified"]
+            entry["fetched_at"] = time.time()
+            return entry
+
+    def record(self, outcome):
+        CACHE_EVENTS.labels("feed", outcome).inc()
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def report(self, shard, stats):
+        """Record the stats() of a scrape worker's cache, which serves that shard's feeds"""
+        with self._lock:
+            self._reported[shard] = stats
+
+    def _totals(self):
+        # Callers hold self._lock
+        totals = {**self.counters, "entries": len(self._entries)}
+        for stats in self._reported.values():
+            for name in totals:
+                totals[name] += stats.get(name, 0)
+        return totals
+
+    def hit_ratio(self):
+        """Share of fetches answered without reparsing"""
+        with self._lock:
+            totals = self._totals()
+        total = totals["not_modified"] + totals["unchanged"] + totals["parsed"]
+        reused = totals["not_modified"] + totals["unchanged"]
+        return reused / total if total else 0.0
+
+    def stats(self):
+        """Counters and entry count, summed over this process and any scrape workers"""
+        with self._lock:
+            stats = self._totals()
+            if self._reported:
+                stats["workers"] = len(self._reported)
+            return stats
+
+
+def digest(body):
+    return hashlib.sha1(body).hexdigest()
+
+
+feed_cache = FeedCache()
+cache_ratios.register("feed", feed_cache.hit_ratio)
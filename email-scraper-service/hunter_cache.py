@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+from metrics import CACHE_EVENTS, cache_ratios
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+HUNTER_CACHE_PATH = os.getenv("HUNTER_CACHE_PATH", str(CACHE_DIR / "hunter_cache.sqlite3"))
+HUNTER_CACHE_MAX_ENTRIES = int(os.getenv("HUNTER_CACHE_MAX_ENTRIES", 50000))
+
+DAY = 24 * 60 * 60
+HIT_TTL = float(os.getenv("HUNTER_CACHE_HIT_TTL", 30 * DAY))
+MISS_TTL = float(os.getenv("HUNTER_CACHE_MISS_TTL", 7 * DAY))
+ERROR_TTL = float(os.getenv("HUNTER_CACHE_ERROR_TTL", 60 * 60))
+# A hit only rewrites accessed_at once it is this stale; eviction order
+# doesn't need finer resolution, and most hits then cost no write at all
+ACCESS_RESOLUTION = 60
+
+# Results that say nothing about the journalist and must never be cached
+UNCACHEABLE_SOURCES = {"missing_api_key"}
+ERROR_SOURCES = {"api_error", "error"}
+
+
+def _normalize(value):
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.lower().split())
+
+
+def cache_key(first_name, last_name, domain):
+    domain = _normalize(domain)
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return f"{_normalize(first_name)}|{_normalize(last_name)}|{domain}"
+
+
+class HunterCache:
+    """
+    SQLite-backed cache of Hunter email-finder results.
+
+    Found emails, misses and errors expire after separate TTLs, and the
+    table is trimmed back to `max_entries` by least-recent access.
+    """
+
+    def __init__(self, path=HUNTER_CACHE_PATH, max_entries=HUNTER_CACHE_MAX_ENTRIES,
+                 hit_ttl=HIT_TTL, miss_ttl=MISS_TTL, error_ttl=ERROR_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.error_ttl = error_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS hunter_cache (
+                key TEXT PRIMARY KEY,
+                email TEXT,
+                score INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_hunter_cache_accessed ON hunter_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, first_name, last_name, domain):
+        """Return a cached (email, score, source) tuple, or None on a miss"""
+        key = cache_key(first_name, last_name, domain)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT email, score, source, expires_at, accessed_at FROM hunter_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or row[3] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM hunter_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                CACHE_EVENTS.labels("hunter", "miss").inc()
+                return None
+
+            if now - row[4] >= ACCESS_RESOLUTION:
+                self._conn.execute("UPDATE hunter_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.hits += 1
+            CACHE_EVENTS.labels("hunter", "hit").inc()
+            return row[0], row[1], row[2]
+
+    def set(self, first_name, last_name, domain, email, score, source):
+        if source in UNCACHEABLE_SOURCES:
+            return
+
+        if email:
+            ttl = self.hit_ttl
+        elif source in ERROR_SOURCES:
+            ttl = self.error_ttl
+        else:
+            ttl = self.miss_ttl
+
+        key = cache_key(first_name, last_name, domain)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hunter_cache (key, email, score, source, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, email, score, source, now + ttl, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        size = self._conn.execute("SELECT COUNT(*) FROM hunter_cache").fetchone()[0]
+        if size <= self.max_entries:
+            return
+        # Trim a little below the limit so we don't evict on every insert
+        excess = size - self.max_entries + max(1, self.max_entries // 10)
+        self._conn.execute(
+            "DELETE FROM hunter_cache WHERE key IN "
+            "(SELECT key FROM hunter_cache ORDER BY accessed_at ASC LIMIT ?)",
+            (excess,)
+        )
+
+    def found(self, min_score):
+        """(first, last, domain, email) for unexpired Hunter hits scoring at least `min_score`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, email FROM hunter_cache "
+                "WHERE email IS NOT NULL AND source = 'hunter' AND score >= ? AND expires_at > ?",
+                (min_score, time.time())
+            ).fetchall()
+        return [(*key.split("|"), email) for key, email in rows]
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM hunter_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+
+
+def get_hunter_cache():
+    global _cache
+    if _cache is None:
+        _cache = HunterCache()
+        cache_ratios.register("hunter", _cache.hit_ratio)
+    return _cache
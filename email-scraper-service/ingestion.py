@@ -0,0 +1,230 @@
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from keyword_index import KeywordIndex
+from metrics import stage_timer
+from publisher_health import CircuitOpenError
+from publishers import registry
+from run_scraper import (
+    FEED_TIMEOUT,
+    collect_journalists,
+    fetch_publisher_feed,
+    finalize_journalists,
+    new_journalist_index,
+    new_match_stats,
+    parse_topic_keywords,
+    record_bylines,
+    report_match_stats,
+    select_publishers,
+)
+
+# "ingest" (the default) polls feeds on a background thread and serves /scrape
+# from the article store, so only articles inside ARTICLE_WINDOW match;
+# "live" fetches feeds per request and matches every entry. Tests and
+# benchmarks pin "live" so they don't depend on background I/O.
+SCRAPER_MODE = os.getenv("SCRAPER_MODE", "ingest").lower()
+INGEST_INTERVAL = float(os.getenv("SCRAPER_INGEST_INTERVAL", 15 * 60))
+INGEST_WORKERS = int(os.getenv("SCRAPER_INGEST_WORKERS", 8))
+ARTICLE_WINDOW = float(os.getenv("SCRAPER_ARTICLE_WINDOW_HOURS", 72)) * 60 * 60
+ARTICLE_STORE_MAX = int(os.getenv("SCRAPER_ARTICLE_STORE_MAX", 20000))
+
+
+class ArticleStore:
+    """
+    Bounded, time-windowed store of ingested articles.
+
+    Articles are deduplicated on their guid/link and kept per publisher.
+    Anything older than `window` seconds is dropped on prune, and the
+    oldest articles are evicted once `max_articles` is exceeded. Every
+    article is tokenized once on ingest into a shared keyword index.
+    """
+
+    def __init__(self, window=ARTICLE_WINDOW, max_articles=ARTICLE_STORE_MAX):
+        self.window = window
+        self.max_articles = max_articles
+        # domain|article id -> (publisher name, article), oldest insertion first
+        self._articles = OrderedDict()
+        self._index = KeywordIndex()
+        self._publisher_counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add_feed(self, pub, articles):
+        """Ingest a feed's articles. Returns the articles that were new."""
+        cutoff = time.time() - self.window
+        added = []
+        with self._lock:
+            for article in articles:
+                if article.timestamp < cutoff:
+                    continue
+
+                # Feeds of the same outlet often repeat entries; dedupe per domain
+                key = f"{pub['domain']}|{article.id}"
+                if not article.id or key in self._articles:
+                    continue
+
+                self._articles[key] = (pub["name"], article)
+                self._index.add(key, article.terms)
+                self._publisher_counts[pub["name"]] += 1
+                added.append(article)
+
+            while len(self._articles) > self.max_articles:
+                self._evict(next(iter(self._articles)))
+        return added
+
+    def _evict(self, key):
+        pub_name, article = self._articles.pop(key)
+        self._index.remove(key, article.terms)
+        self._publisher_counts[pub_name] -= 1
+
+    def prune(self):
+        cutoff = time.time() - self.window
+        with self._lock:
+            expired = [key for key, (_, article) in self._articles.items() if article.timestamp < cutoff]
+            for key in expired:
+                self._evict(key)
+        return len(expired)
+
+    def match(self, keywords, publisher_names):
+        """
+        Articles matching any keyword, grouped by publisher name and newest first,
+        plus the number of stored articles the query covered.
+        """
+        grouped = {}
+        with self._lock:
+            for key in self._index.match_any(keywords):
+                pub_name, article = self._articles[key]
+                if pub_name in publisher_names:
+                    grouped.setdefault(pub_name, []).append(article)
+            checked = sum(self._publisher_counts[name] for name in publisher_names)
+        for articles in grouped.values():
+            articles.sort(key=lambda article: article.timestamp, reverse=True)
+        return grouped, checked
+
+    def __len__(self):
+        return len(self._articles)
+
+
+class FeedIngestor:
+    """
+    Background thread that polls every publisher on its own schedule and
+    feeds new entries into an ArticleStore.
+
+    Publishers may set a `poll_interval` (seconds) to override the default.
+    Without an explicit `publishers` list it follows the publisher
+    registry: feeds added on reload are polled right away, removed ones
+    are dropped from the schedule.
+    """
+
+    def __init__(self, store, publishers=None, interval=INGEST_INTERVAL, max_workers=INGEST_WORKERS):
+        self.store = store
+        self.publishers = publishers
+        self.interval = interval
+        self.max_workers = max_workers
+        self.ready = threading.Event()
+        self.last_polled = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="feed-ingestor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=FEED_TIMEOUT + 1)
+
+    def _poll(self, pub):
+        try:
+            added = self.store.add_feed(pub, fetch_publisher_feed(pub))
+            if added:
+                record_bylines(pub, added)
+                print(f"[ingest] {pub['name']}: {len(added)} new articles")
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            print(f"[ingest] {pub['name']}: {e}")
+        self.last_polled[pub["name"]] = time.time()
+
+    def _feeds(self):
+        """Publishers to poll by feed URL, with a version that changes when they do"""
+        if self.publishers is None:
+            return registry.current().by_feed, registry.version
+        return {pub["rss"]: pub for pub in self.publishers}, 0
+
+    def _run(self):
+        # (next due time, feed URL)
+        schedule = []
+        scheduled = set()
+        feeds, version = {}, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stop.is_set():
+                latest, latest_version = self._feeds()
+                if latest_version != version:
+                    feeds, version = latest, latest_version
+                    # New feeds are due immediately
+                    for rss in feeds.keys() - scheduled:
+                        heapq.heappush(schedule, (0.0, rss))
+                        scheduled.add(rss)
+
+                now = time.monotonic()
+                due = []
+                while schedule and schedule[0][0] <= now:
+                    rss = heapq.heappop(schedule)[1]
+                    if rss in feeds:
+                        due.append(feeds[rss])
+                    else:
+                        scheduled.discard(rss)
+
+                if due:
+                    list(executor.map(self._poll, due))
+                    pruned = self.store.prune()
+                    print(f"[ingest] Polled {len(due)} feeds, store holds {len(self.store)} articles"
+                          + (f" ({pruned} expired)" if pruned else ""))
+                    self.ready.set()
+
+                    now = time.monotonic()
+                    for pub in due:
+                        heapq.heappush(schedule, (now + pub.get("poll_interval", self.interval), pub["rss"]))
+
+                wait = schedule[0][0] - time.monotonic() if schedule else self.interval
+                if self.publishers is None:
+                    # Wake up often enough to notice registry reloads
+                    wait = min(wait, registry.reload_interval)
+                self._stop.wait(max(0.5, wait))
+
+
+def query_journalists(store, topic: str, geography: str = None, limit: int = None):
+    """Answer a topic/geography query purely from the ingested article store"""
+    journalists = new_journalist_index()
+
+    topic_keywords = parse_topic_keywords(topic)
+    print(f"Topic keywords for matching: {topic_keywords}")
+
+    publishers = select_publishers(geography)
+    with stage_timer("match", log=False):
+        grouped, checked = store.match(topic_keywords, {pub["name"] for pub in publishers})
+    stats = new_match_stats()
+    stats["checked"] = checked
+
+    for pub in publishers:
+        collect_journalists(pub, grouped.get(pub["name"], []), journalists, stats, topic_keywords)
+
+    print(f"\n--- Store Query Statistics ---")
+    print(f"Publishers queried: {len(publishers)} ({len(grouped)} with matching articles)")
+    report_match_stats(stats, journalists)
+    print(f"------------------------------\n")
+
+    return finalize_journalists(journalists, topic_keywords, limit)
+
+
+article_store = ArticleStore()
+feed_ingestor = FeedIngestor(article_store)
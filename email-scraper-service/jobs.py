@@ -0,0 +1,291 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from hunter_cache import CACHE_DIR
+from metrics import ERRORS, log_event, request_id_var
+from streaming import stream_scrape_events
+
+SCRAPE_JOBS_PATH = os.getenv("SCRAPE_JOBS_PATH", str(CACHE_DIR / "scrape_jobs.sqlite3"))
+SCRAPE_JOB_WORKERS = int(os.getenv("SCRAPE_JOB_WORKERS", 2))
+SCRAPE_JOB_MAX_PENDING = int(os.getenv("SCRAPE_JOB_MAX_PENDING", 50))
+SCRAPE_JOB_TTL = float(os.getenv("SCRAPE_JOB_TTL", 24 * 60 * 60))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+# Finished with results, but some publisher feeds couldn't be fetched
+PARTIAL = "partial"
+FAILED = "failed"
+INTERRUPTED = "interrupted"
+FINISHED_STATES = {SUCCEEDED, PARTIAL, FAILED, INTERRUPTED}
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobStore:
+    """SQLite persistence for scrape jobs; finished results expire after a TTL"""
+
+    def __init__(self, path=SCRAPE_JOBS_PATH, ttl=SCRAPE_JOB_TTL):
+        self.ttl = ttl
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    progress TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def mark_interrupted(self):
+        """
+        Jobs that were in flight when the service stopped can't be resumed.
+        Only call this from the serving process at startup: scrape worker
+        processes import the app module too, and must not touch live jobs.
+        """
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE scrape_jobs SET status = ?, error = ? WHERE status IN (?, ?)",
+                (INTERRUPTED, "Service restarted before the job finished", QUEUED, RUNNING)
+            ).rowcount
+            self._conn.commit()
+        return updated
+
+    def save(self, job):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrape_jobs "
+                "(id, status, params, progress, result, error, created_at, updated_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.status, json.dumps(job.params), json.dumps(job.progress),
+                    json.dumps(job.results()) if job.status in FINISHED_STATES else None,
+                    job.error, job.created_at, now, now + self.ttl,
+                )
+            )
+            self._conn.commit()
+
+    def load(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, params, progress, result, error, created_at, updated_at "
+                "FROM scrape_jobs WHERE id = ? AND expires_at > ?", (job_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "params": json.loads(row[2]),
+            "progress": json.loads(row[3]),
+            "journalists": json.loads(row[4]) if row[4] else [],
+            "error": row[5],
+            "created_at": row[6],
+            "updated_at": row[7],
+        }
+
+    def purge_expired(self):
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM scrape_jobs WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._conn.commit()
+        return deleted
+
+
+class ScrapeJob:
+    """In-memory state of a queued or running job, with its event log for streaming"""
+
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.progress = {"publishers_done": 0, "journalists": 0, "enriched": 0, "errors": 0,
+                         "failed_publishers": {}}
+        self.scrape_error = None
+        self.journalists = OrderedDict()
+        self.events = []
+        self.changed = asyncio.Condition()
+
+    async def apply(self, event, data):
+        if event == "publisher":
+            self.progress["publishers_done"] += 1
+            if data["status"] != "ok":
+                self.progress["failed_publishers"][data["publication_name"]] = data["status"]
+        elif event == "journalist":
+            self.journalists[data["key"]] = data
+            self.progress["journalists"] += 1
+        elif event == "enrichment":
+            self.journalists[data["key"]].update(data)
+            self.progress["enriched"] += 1
+        elif event == "error":
+            self.progress["errors"] += 1
+            if "key" not in data:
+                # The scrape itself failed, not one journalist's enrichment
+                self.scrape_error = data["detail"]
+        elif event == "done":
+            self.progress["enrichment"] = data["enrichment"]
+        await self._publish(event, data)
+
+    def outcome(self):
+        """
+        (status, error) for a job whose event stream ended: FAILED if the
+        scrape broke off or every publisher feed failed, PARTIAL if it has
+        results despite that or some feeds failed, else SUCCEEDED.
+        """
+        failed = len(self.progress["failed_publishers"])
+        done = self.progress["publishers_done"]
+        if self.scrape_error is not None:
+            return (PARTIAL if self.journalists else FAILED), self.scrape_error
+        if failed and failed == done:
+            return FAILED, f"All {failed} publisher feeds failed"
+        if failed:
+            return PARTIAL, f"{failed} of {done} publisher feeds failed"
+        return SUCCEEDED, None
+
+    async def finish(self, status, error=None):
+        self.status = status
+        self.error = error
+        await self._publish("status", {"status": status, "error": error})
+
+    async def _publish(self, event, data):
+        async with self.changed:
+            self.events.append((event, data))
+            self.changed.notify_all()
+
+    def results(self):
+        return list(self.journalists.values())
+
+    def snapshot(self):
+        """A copy of the job's state; take it on the event loop, which is what updates it"""
+        progress = {**self.progress, "failed_publishers": dict(self.progress["failed_publishers"])}
+        return {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "progress": progress,
+            "journalists": [dict(journalist) for journalist in self.results()],
+            "error": self.error,
+            "created_at": self.created_at,
+        }
+
+
+class JobManager:
+    """
+    Runs scrape jobs on a bounded pool of async workers.
+
+    `make_source(params)` returns the (publisher summary, journalists) async
+    iterator for a job, the same shape /scrape/stream consumes.
+    """
+
+    def __init__(self, make_source, api_key, store=None, workers=SCRAPE_JOB_WORKERS,
+                 max_pending=SCRAPE_JOB_MAX_PENDING):
+        self.make_source = make_source
+        self.api_key = api_key
+        self.store = store or JobStore()
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max(1, workers))
+        self._active = {}
+        self._tasks = set()
+
+    def start(self):
+        """Startup hook: fail over jobs a previous run left queued or running"""
+        self.store.mark_interrupted()
+
+    def submit(self, params):
+        pending = sum(1 for job in self._active.values() if job.status == QUEUED)
+        if pending >= self.max_pending:
+            raise JobQueueFull(f"{pending} scrape jobs already queued")
+
+        job = ScrapeJob(params)
+        self._active[job.id] = job
+        self.store.save(job)
+        task = asyncio.create_task(self._run(job, request_id_var.get()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job, request_id):
+        request_id_var.set(request_id)
+        async with self._slots:
+            job.status = RUNNING
+            self.store.save(job)
+            log_event("job_started", job_id=job.id, **job.params)
+            started = time.perf_counter()
+            try:
+                source = self.make_source(job.params)
+                async for event, data in stream_scrape_events(source, self.api_key):
+                    await job.apply(event, data)
+                await job.finish(*job.outcome())
+            except asyncio.CancelledError:
+                # Tell anyone following the job's events, even if cancelled again meanwhile
+                await asyncio.shield(job.finish(INTERRUPTED, "Service shut down before the job finished"))
+                raise
+            except Exception as e:
+                ERRORS.labels("job", type(e).__name__).inc()
+                await job.finish(FAILED, str(e))
+            finally:
+                self.store.save(job)
+                self._active.pop(job.id, None)
+                log_event("job_finished", job_id=job.id, status=job.status,
+                          seconds=round(time.perf_counter() - started, 3), **job.progress)
+        self.store.purge_expired()
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def get(self, job_id):
+        job = self._active.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        return self.store.load(job_id)
+
+    async def events(self, job_id):
+        """
+        Yield (event, data) for a job: everything so far, then live events
+        until it finishes. A finished job replays its stored results.
+        """
+        job = self._active.get(job_id)
+        if job is None:
+            stored = self.store.load(job_id)
+            if stored is None:
+                return
+            for journalist in stored["journalists"]:
+                yield "journalist", journalist
+            yield "status", {"status": stored["status"], "error": stored["error"]}
+            return
+
+        position = 0
+        while True:
+            async with job.changed:
+                while position >= len(job.events):
+                    await job.changed.wait()
+                batch = job.events[position:]
+            position += len(batch)
+            for event, data in batch:
+                yield event, data
+                if event == "status":
+                    return
@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from hunter_cache import CACHE_DIR
+from metrics import stage_timer
+from models import journalist_key
+
+JOURNALIST_STORE_PATH = os.getenv("JOURNALIST_STORE_PATH", str(CACHE_DIR / "journalists.sqlite3"))
+PROFILE_TOPICS = int(os.getenv("JOURNALIST_PROFILE_TOPICS", 10))
+PROFILE_ARTICLES = int(os.getenv("JOURNALIST_PROFILE_ARTICLES", 5))
+
+PROFILE_COLUMNS = (
+    "key", "first_name", "last_name", "publication_name", "domain", "region",
+    "first_seen", "last_seen", "article_count", "email", "email_confidence", "email_source", "enriched_at",
+)
+
+
+class JournalistStore:
+    """
+    SQLite-backed journalist profiles, updated incrementally as feeds are parsed.
+
+    Profiles are keyed like the scrape results (`first-last-domain`) and keep
+    the full byline history, a count per topic term across that history, and
+    the last enrichment result. Topic searches go through the term table's
+    primary key instead of rescanning articles.
+    """
+
+    def __init__(self, path=JOURNALIST_STORE_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS journalists (
+                key TEXT PRIMARY KEY,
+                first_name TEXT NOT NULL,
+                last_name TEXT NOT NULL,
+                publication_name TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                region TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                article_count INTEGER NOT NULL DEFAULT 0,
+                email TEXT,
+                email_confidence INTEGER,
+                email_source TEXT,
+                enriched_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_journalists_region ON journalists (region, last_seen);
+
+            CREATE TABLE IF NOT EXISTS journalist_articles (
+                key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                published TEXT NOT NULL,
+                published_at REAL NOT NULL,
+                PRIMARY KEY (key, url)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_journalist_articles_recent ON journalist_articles (key, published_at);
+
+            CREATE TABLE IF NOT EXISTS journalist_terms (
+                term TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (term, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_journalist_terms_key ON journalist_terms (key, count);
+        """)
+        self._conn.commit()
+
+    def record_articles(self, pub, bylines):
+        """
+        Fold newly parsed articles into the profiles. `bylines` is a list of
+        (article, [(first_name, last_name), ...]); articles already on record
+        for a journalist are skipped, so re-recording a feed is harmless.
+        Returns the number of new (journalist, article) pairs.
+        """
+        added = 0
+        with self._lock, self._conn:
+            for article, authors in bylines:
+                url = article.link or article.id
+                if not url:
+                    continue
+                published_at = article.timestamp
+                for first_name, last_name in authors:
+                    key = journalist_key(first_name, last_name, pub["domain"])
+                    inserted = self._conn.execute(
+                        "INSERT OR IGNORE INTO journalist_articles (key, url, title, published, published_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, url, article.title, article.published, published_at)
+                    ).rowcount
+                    if not inserted:
+                        continue
+                    added += 1
+
+                    self._conn.execute("""
+                        INSERT INTO journalists
+                            (key, first_name, last_name, publication_name, domain, region,
+                             first_seen, last_seen, article_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+                        ON CONFLICT (key) DO UPDATE SET
+                            publication_name = excluded.publication_name,
+                            region = excluded.region,
+                            first_seen = MIN(first_seen, excluded.first_seen),
+                            last_seen = MAX(last_seen, excluded.last_seen),
+                            article_count = article_count + 1
+                    """, (key, first_name, last_name, pub["name"], pub["domain"], pub.get("region", ""),
+                          published_at, published_at))
+
+                    self._conn.executemany("""
+                        INSERT INTO journalist_terms (term, key, count, last_seen) VALUES (?, ?, 1, ?)
+                        ON CONFLICT (term, key) DO UPDATE SET
+                            count = count + 1,
+                            last_seen = MAX(last_seen, excluded.last_seen)
+                    """, [(term, key, published_at) for term in article.terms])
+        return added
+
+    def record_enrichments(self, journalists):
+        """
+        Store enrichment results in one transaction, each unless the stored
+        one is more confident, so a later editor@ fallback or a miss never
+        replaces a verified address. Returns how many rows were updated.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.executemany(
+                "UPDATE journalists SET email = ?, email_confidence = ?, email_source = ?, enriched_at = ? "
+                "WHERE key = ? AND (email IS NULL OR COALESCE(email_confidence, 0) <= ?)",
+                [(j.email, j.email_confidence or 0, j.email_source, now, j.key, j.email_confidence or 0)
+                 for j in journalists]
+            ).rowcount
+
+    def search(self, keywords, regions=None, since=None, limit=50):
+        """
+        Journalists who have written about any of `keywords`, ranked by how
+        many of their articles mention them. `regions` restricts to publisher
+        regions and `since` (epoch seconds) to terms seen after that time.
+        """
+        if not keywords:
+            return []
+
+        sql = [
+            "SELECT t.key, SUM(t.count) AS hits FROM journalist_terms t",
+            "JOIN journalists j ON j.key = t.key",
+            f"WHERE t.term IN ({', '.join('?' * len(keywords))})",
+        ]
+        params = list(keywords)
+        if regions is not None:
+            sql.append(f"AND j.region IN ({', '.join('?' * len(regions))})")
+            params.extend(regions)
+        if since is not None:
+            sql.append("AND t.last_seen >= ?")
+            params.append(since)
+        sql.append("GROUP BY t.key ORDER BY hits DESC, j.last_seen DESC LIMIT ?")
+        params.append(limit)
+
+        with stage_timer("journalist_search", log=False), self._lock:
+            ranked = self._conn.execute(" ".join(sql), params).fetchall()
+            return [{**self._profile(key), "matched_articles": hits} for key, hits in ranked]
+
+    def profile(self, key):
+        with self._lock:
+            return self._profile(key)
+
+    def _profile(self, key):
+        row = self._conn.execute(
+            f"SELECT {', '.join(PROFILE_COLUMNS)} FROM journalists WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        profile = dict(zip(PROFILE_COLUMNS, row))
+        profile["topics"] = [term for (term,) in self._conn.execute(
+            "SELECT term FROM journalist_terms WHERE key = ? ORDER BY count DESC, last_seen DESC LIMIT ?",
+            (key, PROFILE_TOPICS)
+        )]
+        profile["recent_articles"] = [
+            {"title": title, "url": url, "published": published}
+            for title, url, published in self._conn.execute(
+                "SELECT title, url, published FROM journalist_articles WHERE key = ? "
+                "ORDER BY published_at DESC LIMIT ?", (key, PROFILE_ARTICLES)
+            )
+        ]
+        return profile
+
+    def stats(self):
+        with self._lock:
+            journalists, = self._conn.execute("SELECT COUNT(*) FROM journalists").fetchone()
+            articles, = self._conn.execute("SELECT COUNT(*) FROM journalist_articles").fetchone()
+            enriched, = self._conn.execute("SELECT COUNT(*) FROM journalists WHERE enriched_at IS NOT NULL").fetchone()
+        return {"journalists": journalists, "articles": articles, "enriched": enriched}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+
+
+def get_journalist_store():
+    global _store
+    if _store is None:
+        _store = JournalistStore()
+    return _store
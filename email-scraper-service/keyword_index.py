@@ -0,0 +1,74 @@
+import re
+from collections import defaultdict
+
+# Common words ignored when extracting topic keywords
+STOP_WORDS = {'in', 'the', 'of', 'and', 'or', 'a', 'an', 'to', 'for'}
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def normalize_term(word):
+    """Fold simple plurals so "startups" and "startup" share a posting list"""
+    if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Ordered, de-duplicated index terms for a piece of text"""
+    text = TAG_PATTERN.sub(' ', text or '').lower()
+    terms = (normalize_term(w) for w in TOKEN_PATTERN.findall(text) if w not in STOP_WORDS and len(w) > 2)
+    return list(dict.fromkeys(terms))
+
+
+def article_terms(title, summary):
+    return tokenize(f"{title} {summary}")
+
+
+class KeywordIndex:
+    """Inverted index from term to the ids of articles containing it"""
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+
+    def add(self, article_id, terms):
+        for term in terms:
+            self._postings[term].add(article_id)
+
+    def remove(self, article_id, terms):
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.discard(article_id)
+            if not postings:
+                del self._postings[term]
+
+    def match_any(self, keywords):
+        """Ids of articles containing at least one of the keywords"""
+        matched = set()
+        for keyword in keywords:
+            matched |= self._postings.get(normalize_term(keyword), set())
+        return matched
+
+    def match_all(self, keywords):
+        """Ids of articles containing every keyword"""
+        postings = sorted((self._postings.get(normalize_term(k), set()) for k in keywords), key=len)
+        if not postings:
+            return set()
+        matched = set(postings[0])
+        for ids in postings[1:]:
+            matched &= ids
+        return matched
+
+    def __len__(self):
+        return len(self._postings)
+
+
+def build_index(articles):
+    """Index a list of articles by their position in the list"""
+    index = KeywordIndex()
+    for position, article in enumerate(articles):
+        index.add(position, article.terms)
+    return index
@@ -0,0 +1,125 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20)
+
+REQUEST_SECONDS = Histogram(
+    "scraper_request_seconds", "End-to-end HTTP request latency",
+    ["endpoint", "status"], buckets=STAGE_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds", "Time spent per pipeline stage (fetch, parse, match, name_parsing, enrichment)",
+    ["stage"], buckets=STAGE_BUCKETS,
+)
+PUBLISHER_FETCH_SECONDS = Histogram(
+    "scraper_publisher_fetch_seconds", "Feed fetch latency per publisher",
+    ["publisher", "status"], buckets=FETCH_BUCKETS,
+)
+HUNTER_REQUEST_SECONDS = Histogram(
+    "scraper_hunter_request_seconds", "Hunter email-finder HTTP request latency",
+    ["status"], buckets=FETCH_BUCKETS,
+)
+CACHE_EVENTS = Counter(
+    "scraper_cache_events_total", "Cache lookups by cache and result",
+    ["cache", "result"],
+)
+ERRORS = Counter(
+    "scraper_errors_total", "Errors by pipeline stage and kind",
+    ["stage", "kind"],
+)
+ARTICLES = Counter(
+    "scraper_articles_total", "Articles seen by the matcher (checked, matched, with_authors)",
+    ["result"],
+)
+FEED_PARSES = Counter(
+    "scraper_feed_parses_total", "Feed bodies parsed, by parser (fast, fallback, feedparser)",
+    ["parser"],
+)
+ENRICHMENT_RESULTS = Counter(
+    "scraper_enrichment_results_total", "Enrichment outcomes",
+    ["result"],
+)
+DEDUP = Counter(
+    "scraper_dedup_total", "Syndicated duplicates removed before enrichment (articles, journalists)",
+    ["kind"],
+)
+WEB_DISCOVERY = Counter(
+    "scraper_web_discovery_total", "Publisher-site email crawls (found, not_found, timeout, error)",
+    ["result"],
+)
+
+
+class CacheRatioCollector:
+    """Exports cache hit ratios computed from the caches' own counters at scrape time"""
+
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, name, ratio_fn):
+        self._sources[name] = ratio_fn
+
+    def collect(self):
+        gauge = GaugeMetricFamily("scraper_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for name, ratio_fn in self._sources.items():
+            gauge.add_metric([name], ratio_fn())
+        yield gauge
+
+
+cache_ratios = CacheRatioCollector()
+REGISTRY.register(cache_ratios)
+
+
+logger = logging.getLogger("scraper")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(os.getenv("SCRAPER_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+
+def new_request_id():
+    return uuid.uuid4().hex[:16]
+
+
+def log_event(event, **fields):
+    """Emit one structured JSON log line tagged with the current request id"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = {"ts": round(time.time(), 3), "event": event, "request_id": request_id_var.get()}
+    record.update(fields)
+    logger.info(json.dumps(record, default=str))
+
+
+@contextmanager
+def stage_timer(stage, log=True, **fields):
+    """Time a pipeline stage into STAGE_SECONDS and optionally log it"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        if log:
+            log_event("stage", stage=stage, seconds=round(elapsed, 4), **fields)
+
+
+def record_articles(stats):
+    for result in ("checked", "matched", "with_authors"):
+        ARTICLES.labels(result).inc(stats[result])
+
+
+def render_metrics():
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
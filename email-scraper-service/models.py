@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+# Articles listed per journalist in API responses
+RECENT_ARTICLES = 5
+
+
+def journalist_key(first_name, last_name, domain):
+    return f"{first_name}-{last_name}-{domain}"
+
+
+@dataclass(slots=True)
+class Article:
+    """
+    One feed entry, reduced to what matching and bylines need. Built once
+    per parsed feed body; the feedparser entry is not kept around.
+    """
+    id: str
+    title: str
+    link: str
+    published: str
+    timestamp: float
+    author: str
+    terms: List[str]
+    # Fingerprints for syndication dedup, set by dedup.fingerprint_articles
+    url_key: str = ""
+    signature: bytes = b""
+
+    def summary_dict(self):
+        return {"title": self.title, "url": self.link, "published": self.published}
+
+
+@dataclass(slots=True)
+class Journalist:
+    """A journalist matched by a query, with the articles that matched and the enrichment result"""
+    first_name: str
+    last_name: str
+    publication_name: str
+    domain: str
+    topics: Set[str] = field(default_factory=set)
+    articles: List[Article] = field(default_factory=list)
+    email: Optional[str] = None
+    email_confidence: Optional[int] = None
+    email_source: Optional[str] = None
+    # BM25 score against the query topic, once ranked (see ranking.py)
+    relevance: Optional[float] = None
+    # Other outlets that ran this journalist's stories (see dedup.py)
+    syndicated_in: Set[str] = field(default_factory=set)
+
+    @property
+    def key(self):
+        return journalist_key(self.first_name, self.last_name, self.domain)
+
+    def set_email(self, email, confidence, source):
+        self.email = email
+        self.email_confidence = confidence
+        self.email_source = source
+
+    def copy_email(self, other):
+        self.set_email(other.email, other.email_confidence, other.email_source)
+
+    def to_dict(self):
+        """The API response shape; enrichment fields appear once the journalist is enriched"""
+        result = {
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "publication_name": self.publication_name,
+            "domain": self.domain,
+            "topics": sorted(self.topics),
+            **({"relevance": self.relevance} if self.relevance is not None else {}),
+            "recent_articles": [article.summary_dict() for article in self.articles[:RECENT_ARTICLES]],
+        }
+        if self.syndicated_in:
+            result["syndicated_in"] = sorted(self.syndicated_in)
+        if self.email_source is not None:
+            result["email"] = self.email
+            result["email_confidence"] = self.email_confidence
+            result["email_source"] = self.email_source
+        return result
@@ -0,0 +1,163 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+
+HEALTH_WINDOW = int(os.getenv("PUBLISHER_HEALTH_WINDOW", 50))
+FAILURE_THRESHOLD = int(os.getenv("PUBLISHER_FAILURE_THRESHOLD", 3))
+OPEN_COOLDOWN = float(os.getenv("PUBLISHER_OPEN_COOLDOWN", 5 * 60))
+MIN_FEED_TIMEOUT = float(os.getenv("PUBLISHER_MIN_TIMEOUT", 2))
+# Adaptive timeout is this multiple of the observed p95 latency
+TIMEOUT_P95_MULTIPLIER = 2.0
+# Latency samples needed before the adaptive timeout kicks in
+MIN_SAMPLES = 5
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class PublisherHealth:
+    """
+    Rolling health of one feed: recent latencies, failure counts and a
+    circuit breaker.
+
+    After FAILURE_THRESHOLD consecutive failures the circuit opens and the
+    feed is skipped. Once OPEN_COOLDOWN has passed a single half-open probe
+    is let through; success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.latencies = deque(maxlen=HEALTH_WINDOW)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.last_error = None
+        self.last_checked = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a fetch may go out now; claims the half-open probe if due"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= OPEN_COOLDOWN:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def timeout(self, default):
+        """Per-feed timeout derived from the observed p95, capped at `default`"""
+        with self._lock:
+            if len(self.latencies) < MIN_SAMPLES:
+                return default
+            p95 = percentile(self.latencies, 95)
+        return min(default, max(MIN_FEED_TIMEOUT, p95 * TIMEOUT_P95_MULTIPLIER))
+
+    def record_success(self, latency):
+        with self._lock:
+            self.latencies.append(latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self.opened_at = None
+            self.probe_in_flight = False
+            self.last_checked = time.time()
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            self.last_checked = time.time()
+            if self.state == HALF_OPEN or self.consecutive_failures >= FAILURE_THRESHOLD:
+                if self.state != OPEN:
+                    print(f"  Circuit OPEN for {self.name} after {self.consecutive_failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            samples = list(self.latencies)
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, OPEN_COOLDOWN - (time.monotonic() - self.opened_at)), 1)
+            snapshot = {
+                "name": self.name,
+                "url": self.url,
+                "state": self.state,
+                "successes": self.successes,
+                "failures": self.failures,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+                "last_checked": self.last_checked,
+                "retry_in": retry_in,
+            }
+        snapshot["latency"] = {"samples": len(samples)}
+        for pct in (50, 95, 99):
+            value = percentile(samples, pct)
+            snapshot["latency"][f"p{pct}"] = round(value, 4) if value is not None else None
+        return snapshot
+
+
+class HealthRegistry:
+    def __init__(self):
+        self._publishers = {}
+        # Snapshots of feeds whose breakers live in scrape worker processes
+        # (see scrape_workers), with when they arrived
+        self._reported = {}
+        self._lock = threading.Lock()
+
+    def get(self, pub):
+        with self._lock:
+            health = self._publishers.get(pub["rss"])
+            if health is None:
+                health = self._publishers[pub["rss"]] = PublisherHealth(pub["name"], pub["rss"])
+            return health
+
+    def report(self, snapshots):
+        """Record PublisherHealth snapshots sent back by a worker process"""
+        received = time.monotonic()
+        with self._lock:
+            for snapshot in snapshots:
+                self._reported[snapshot["url"]] = (snapshot, received)
+
+    def snapshot(self):
+        with self._lock:
+            publishers = list(self._publishers.values())
+            reported = [entry for url, entry in self._reported.items() if url not in self._publishers]
+        snapshots = [h.snapshot() for h in publishers]
+        now = time.monotonic()
+        for snapshot, received in reported:
+            if snapshot["retry_in"] is not None:
+                snapshot = {**snapshot, "retry_in": round(max(0.0, snapshot["retry_in"] - (now - received)), 1)}
+            snapshots.append(snapshot)
+        snapshots.sort(key=lambda s: s["name"])
+        states = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        for s in snapshots:
+            states[s["state"]] += 1
+        return {"states": states, "publishers": snapshots}
+
+
+publisher_health = HealthRegistry()
@@ -1,247 +1,211 @@
-PUBLISHERS = [
-    {
-        "name": "New York Times",
-        "rss": "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml",
-        "domain": "nytimes.com",
-        "region": "Northeast",
-        "author_fields": ["dc_creator", "byline", "author"]
-    },
-    {
-        "name": "Reuters",
-        "rss": "https://www.reutersagency.com/feed/?taxonomy=best-topics&post_type=best",
-        "domain": "reuters.com",
-        "region": "National",
-        "author_fields": ["author"]
-    },
-    {
-        "name": "TechCrunch",
-        "rss": "https://techcrunch.com/feed/",
-        "domain": "techcrunch.com",
-        "region": "West Coast",
-        "author_fields": ["dc_creator", "author"]
-    },
-    {
-        "name": "The Verge",
-        "rss": "https://www.theverge.com/rss/index.xml",
-        "domain": "theverge.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Wired",
-        "rss": "https://www.wired.com/feed/rss",
-        "domain": "wired.com",
-        "region": "West Coast",
-        "author_fields": ["dc_creator", "author"]
-    },
-    {
-        "name": "Ars Technica",
-        "rss": "https://feeds.arstechnica.com/arstechnica/index",
-        "domain": "arstechnica.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "The Wall Street Journal Tech",
-        "rss": "https://feeds.a.dj.com/rss/RSSWSJD.xml",
-        "domain": "wsj.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "CNN Business Tech",
-        "rss": "http://rss.cnn.com/rss/cnn_tech.rss",
-        "domain": "cnn.com",
-        "region": "Southeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "BBC Technology",
-        "rss": "http://feeds.bbci.co.uk/news/technology/rss.xml",
-        "domain": "bbc.com",
-        "region": "International",
-        "author_fields": ["author"]
-    },
-    {
-        "name": "CNET",
-        "rss": "https://www.cnet.com/rss/news/",
-        "domain": "cnet.com",
-        "region": "West Coast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "VentureBeat",
-        "rss": "https://venturebeat.com/feed/",
-        "domain": "venturebeat.com",
-        "region": "West Coast",
-        "author_fields": ["dc_creator", "author"]
-    },
-    {
-        "name": "Engadget",
-        "rss": "https://www.engadget.com/rss.xml",
-        "domain": "engadget.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "ZDNet",
-        "rss": "https://www.zdnet.com/news/rss.xml",
-        "domain": "zdnet.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Forbes Technology",
-        "rss": "https://www.forbes.com/innovation/feed/",
-        "domain": "forbes.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Fast Company Technology",
-        "rss": "https://www.fastcompany.com/technology/rss",
-        "domain": "fastcompany.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "MIT Technology Review",
-        "rss": "https://www.technologyreview.com/feed/",
-        "domain": "technologyreview.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Boston Globe Tech",
-        "rss": "https://www.bostonglobe.com/business/technology/?outputType=rss",
-        "domain": "bostonglobe.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Philadelphia Inquirer Business",
-        "rss": "https://www.inquirer.com/arc/outboundfeeds/rss/category/business/",
-        "domain": "inquirer.com",
-        "region": "Northeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Washington Post Tech",
-        "rss": "https://feeds.washingtonpost.com/rss/business/technology",
-        "domain": "washingtonpost.com",
-        "region": "Mid-Atlantic",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "USA Today Tech",
-        "rss": "http://rssfeeds.usatoday.com/usatoday-TechTopStories",
-        "domain": "usatoday.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Miami Herald Business",
-        "rss": "https://www.miamiherald.com/news/business/arc.xml",
-        "domain": "miamiherald.com",
-        "region": "Southeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Atlanta Journal-Constitution Business",
-        "rss": "https://www.ajc.com/business/?outputType=rss",
-        "domain": "ajc.com",
-        "region": "Southeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Charlotte Observer Business",
-        "rss": "https://www.charlotteobserver.com/news/business/arc.xml",
-        "domain": "charlotteobserver.com",
-        "region": "Southeast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Austin American-Statesman Tech",
-        "rss": "https://www.statesman.com/business/?outputType=rss",
-        "domain": "statesman.com",
-        "region": "Southwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Chicago Tribune Business",
-        "rss": "https://www.chicagotribune.com/business/?outputType=rss",
-        "domain": "chicagotribune.com",
-        "region": "Midwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Detroit Free Press Business",
-        "rss": "https://www.freep.com/business/?outputType=rss",
-        "domain": "freep.com",
-        "region": "Midwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Denver Post Business",
-        "rss": "https://www.denverpost.com/business/feed/",
-        "domain": "denverpost.com",
-        "region": "Mountain West",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Arizona Republic Business",
-        "rss": "https://www.azcentral.com/business/?outputType=rss",
-        "domain": "azcentral.com",
-        "region": "Southwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Seattle Times Business",
-        "rss": "https://www.seattletimes.com/business/feed/",
-        "domain": "seattletimes.com",
-        "region": "Pacific Northwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Portland Oregonian Business",
-        "rss": "https://www.oregonlive.com/arc/outboundfeeds/rss/category/business/",
-        "domain": "oregonlive.com",
-        "region": "Pacific Northwest",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Los Angeles Times Business",
-        "rss": "https://www.latimes.com/business/rss2.0.xml",
-        "domain": "latimes.com",
-        "region": "West Coast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "San Diego Union-Tribune Business",
-        "rss": "https://www.sandiegouniontribune.com/business/?outputType=rss",
-        "domain": "sandiegouniontribune.com",
-        "region": "West Coast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Sacramento Bee Business",
-        "rss": "https://www.sacbee.com/news/business/arc.xml",
-        "domain": "sacbee.com",
-        "region": "West Coast",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "Mashable",
-        "rss": "https://mashable.com/feeds/rss/all",
-        "domain": "mashable.com",
-        "region": "National",
-        "author_fields": ["author", "dc_creator"]
-    },
-    {
-        "name": "TechRadar",
-        "rss": "https://www.techradar.com/rss",
-        "domain": "techradar.com",
-        "region": "International",
-        "author_fields": ["author", "dc_creator"]
-    }
-]
\ No newline at end of file
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from metrics import ERRORS
+
+PUBLISHERS_PATH = os.getenv("PUBLISHERS_PATH", str(Path(__file__).parent / "publishers.json"))
+# How often, at most, the file's mtime is checked for edits
+PUBLISHERS_RELOAD_INTERVAL = float(os.getenv("PUBLISHERS_RELOAD_INTERVAL", 5))
+
+REQUIRED_FIELDS = ("name", "rss", "domain", "region", "author_fields")
+
+
+class PublisherConfigError(ValueError):
+    pass
+
+
+def validate(data):
+    """
+    Check a parsed registry file and return (publishers, region_aliases).
+    Raises PublisherConfigError listing every problem found.
+    """
+    if isinstance(data, list):
+        data = {"publishers": data}
+    if not isinstance(data, dict) or not isinstance(data.get("publishers"), list):
+        raise PublisherConfigError("expected an object with a \"publishers\" list")
+
+    problems = []
+    names, feeds = set(), set()
+    for position, pub in enumerate(data["publishers"]):
+        label = f"publishers[{position}]"
+        if not isinstance(pub, dict):
+            problems.append(f"{label}: not an object")
+            continue
+        label = f"{label} ({pub.get('name', '?')})"
+        missing = [field for field in REQUIRED_FIELDS if not pub.get(field)]
+        if missing:
+            problems.append(f"{label}: missing {', '.join(missing)}")
+            continue
+        if urlsplit(pub["rss"]).scheme not in ("http", "https"):
+            problems.append(f"{label}: rss must be an http(s) URL")
+        if not isinstance(pub["author_fields"], list) or not all(isinstance(f, str) for f in pub["author_fields"]):
+            problems.append(f"{label}: author_fields must be a list of strings")
+        if "poll_interval" in pub and not (isinstance(pub["poll_interval"], (int, float)) and pub["poll_interval"] > 0):
+            problems.append(f"{label}: poll_interval must be a positive number of seconds")
+        if pub["name"] in names:
+            problems.append(f"{label}: duplicate name")
+        if pub["rss"] in feeds:
+            problems.append(f"{label}: duplicate rss")
+        names.add(pub["name"])
+        feeds.add(pub["rss"])
+
+    aliases = data.get("region_aliases", {})
+    if not isinstance(aliases, dict) or not all(
+        regions is None or (isinstance(regions, list) and all(isinstance(r, str) for r in regions))
+        for regions in aliases.values()
+    ):
+        problems.append("region_aliases: each alias maps to a list of regions or null (every publisher)")
+
+    if problems:
+        raise PublisherConfigError("; ".join(problems))
+    return data["publishers"], {alias.lower(): regions for alias, regions in aliases.items()}
+
+
+class PublisherIndex:
+    """
+    Immutable lookup tables over one version of the publisher list, so
+    geography filtering is a dict lookup instead of a scan per request.
+    """
+
+    def __init__(self, publishers, region_aliases=None):
+        self.publishers = list(publishers)
+        self.aliases = dict(region_aliases or {})
+        self.by_region = {}
+        self.by_domain = {}
+        self.by_name = {}
+        self.by_feed = {}
+        for pub in self.publishers:
+            self.by_region.setdefault(pub.get("region", ""), []).append(pub)
+            self.by_domain.setdefault(pub["domain"], pub)
+            self.by_name[pub["name"]] = pub
+            self.by_feed[pub["rss"]] = pub
+        self._selections = {}
+
+    def select(self, geography=None):
+        """
+        Publishers for a geography: an alias ("us", "east coast"), else any
+        region whose name contains it, else everyone. Results are memoized
+        per set of matching regions, not per spelling, so arbitrary user
+        input can't grow the memo; treat them as read-only.
+        """
+        regions = self._regions_for((geography or "").lower().strip())
+        if regions is None:
+            return self.publishers
+        selected = self._selections.get(regions)
+        if selected is None:
+            # Keep registry order, which is also the fetch order
+            selected = self._selections[regions] = [pub for pub in self.publishers if pub.get("region") in regions]
+        return selected
+
+    def _regions_for(self, key):
+        """The regions a geography names, as a frozenset; None means every publisher"""
+        if not key:
+            return None
+        if key in self.aliases:
+            regions = self.aliases[key]
+            return None if regions is None else frozenset(regions)
+        return frozenset(region for region in self.by_region if key in region.lower()) or None
+
+    def regions(self, geography=None):
+        return sorted({pub.get("region", "") for pub in self.select(geography)})
+
+
+class PublisherRegistry:
+    """
+    The publisher list loaded from a JSON file and reloaded when the file
+    changes. An edit that fails validation is logged and ignored, keeping
+    the last good version. `publishers` is one list object updated in
+    place, so modules holding a reference always see the current feeds.
+    """
+
+    def __init__(self, path=PUBLISHERS_PATH, reload_interval=PUBLISHERS_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.publishers = []
+        self.index = PublisherIndex([])
+        self.version = 0
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load(force=True)
+
+    def _load(self, force=False):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            if force:
+                raise
+            ERRORS.labels("publishers", type(e).__name__).inc()
+            return False
+        if mtime == self._mtime and not force:
+            return False
+        # Whatever happens, don't re-read this version of the file on every check
+        self._mtime = mtime
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                publishers, aliases = validate(json.load(f))
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError and PublisherConfigError are both ValueErrors
+            if force:
+                raise
+            ERRORS.labels("publishers", type(e).__name__).inc()
+            print(f"Publisher registry not reloaded from {self.path}: {e}")
+            return False
+        self._install(publishers, aliases)
+        return True
+
+    def _install(self, publishers, aliases):
+        index = PublisherIndex(publishers, aliases)
+        self.publishers[:] = index.publishers
+        # Swapping the reference makes the new index visible to readers in one step
+        self.index = index
+        self.version += 1
+
+    def refresh(self):
+        """Reload the file if it changed; checks at most every `reload_interval` seconds"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return False
+            self._checked_at = now
+            if self.path is None:
+                return False
+            reloaded = self._load()
+        if reloaded:
+            print(f"Publisher registry reloaded: {len(self.publishers)} publishers (version {self.version})")
+        return reloaded
+
+    def replace(self, publishers, region_aliases=None):
+        """Install an explicit publisher list and stop watching the file (tests, benchmarks)"""
+        with self._lock:
+            publishers, aliases = validate({
+                "publishers": list(publishers),
+                "region_aliases": self.index.aliases if region_aliases is None else region_aliases,
+            })
+            self.path = None
+            self._install(publishers, aliases)
+
+    def current(self):
+        self.refresh()
+        return self.index
+
+    def select(self, geography=None):
+        return self.current().select(geography)
+
+    def get_by_domain(self, domain):
+        return self.current().by_domain.get(domain)
+
+    def get_by_feed(self, rss):
+        return self.current().by_feed.get(rss)
+
+
+registry = PublisherRegistry()
+# Backwards-compatible view of the current publishers; updated in place on reload
+PUBLISHERS = registry.publishers
@@ -0,0 +1,89 @@
+import math
+import os
+import time
+
+import numpy as np
+
+from keyword_index import normalize_term
+
+# An article's weight halves every this many days
+RANKING_HALF_LIFE_DAYS = float(os.getenv("RANKING_HALF_LIFE_DAYS", 14))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+DAY = 24 * 60 * 60
+
+
+def recency_weights(timestamps, now=None, half_life_days=RANKING_HALF_LIFE_DAYS):
+    """Exponential decay by article age; future-dated articles count as new"""
+    now = time.time() if now is None else now
+    ages = np.maximum(0.0, now - np.asarray(timestamps, dtype=np.float64)) / DAY
+    return np.exp2(-ages / half_life_days)
+
+
+def bm25_scores(journalists, topic_keywords, now=None, half_life_days=RANKING_HALF_LIFE_DAYS):
+    """
+    BM25 relevance of each journalist to the topic keywords, as an array in
+    input order. A journalist's articles form one document; each article
+    contributes its recency weight to the term frequency of every keyword
+    it contains and to the document length, so recent on-topic coverage
+    outranks old or incidental mentions.
+    """
+    columns = {}
+    for keyword in topic_keywords:
+        columns.setdefault(normalize_term(keyword), len(columns))
+    if not journalists or not columns:
+        return np.zeros(len(journalists))
+
+    # Flatten (journalist row, article) pairs so decay is one vector op
+    rows, timestamps, lengths = [], [], []
+    hit_rows, hit_cols, hit_articles = [], [], []
+    for row, journalist in enumerate(journalists):
+        for article in journalist.articles:
+            position = len(timestamps)
+            rows.append(row)
+            timestamps.append(article.timestamp)
+            lengths.append(len(article.terms))
+            for term in article.terms:
+                col = columns.get(term)
+                if col is not None:
+                    hit_rows.append(row)
+                    hit_cols.append(col)
+                    hit_articles.append(position)
+
+    weights = recency_weights(timestamps, now, half_life_days)
+    doc_length = np.bincount(rows, weights=weights * np.asarray(lengths, dtype=np.float64),
+                             minlength=len(journalists))
+    tf = np.zeros((len(journalists), len(columns)))
+    np.add.at(tf, (np.asarray(hit_rows, dtype=np.intp), np.asarray(hit_cols, dtype=np.intp)),
+              weights[np.asarray(hit_articles, dtype=np.intp)])
+
+    n = len(journalists)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    average = doc_length.mean() or 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_length / average)
+    return (idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+
+def rank_journalists(journalists, topic_keywords, limit=None, now=None):
+    """
+    Journalists ordered best-first by BM25 relevance (see bm25_scores),
+    ties kept in input order, cut to the top `limit`. Sets each returned
+    journalist's `relevance`.
+    """
+    if not topic_keywords:
+        return journalists[:limit] if limit else journalists
+
+    scores = bm25_scores(journalists, topic_keywords, now)
+    order = np.lexsort((np.arange(len(journalists)), -scores))
+    if limit:
+        order = order[:limit]
+
+    ranked = []
+    for position in order:
+        journalist = journalists[position]
+        score = float(scores[position])
+        journalist.relevance = round(score, 4) if math.isfinite(score) else 0.0
+        ranked.append(journalist)
+    return ranked
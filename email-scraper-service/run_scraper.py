@@ -1,245 +1,454 @@
-import feedparser
-import requests
+import calendar
+import contextvars
+import os
+import time
+import httpx
+import transport
 from collections import defaultdict
-from publishers import PUBLISHERS
+from byline import extract_author, parse_name
+from models import Article, Journalist, journalist_key
+from publishers import PublisherIndex, registry
+from feed_cache import feed_cache, digest
+from rss_parser import parse_entries
+from keyword_index import article_terms, build_index, tokenize
+from journalist_store import get_journalist_store
+from ranking import rank_journalists
+from dedup import dedupe_journalists, fingerprint_articles
+from publisher_health import CircuitOpenError, publisher_health
+from singleflight import SingleFlight
+from scrape_workers import get_worker_pool
+from metrics import DEDUP, ERRORS, PUBLISHER_FETCH_SECONDS, log_event, record_articles, stage_timer
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
+FEED_TIMEOUT = 10
+# Retries happen inside the publisher's adaptive timeout budget, so keep them few
+FEED_RETRIES = int(os.getenv("SCRAPER_FEED_RETRIES", 1))
+FETCH_MAX_WORKERS = int(os.getenv("SCRAPER_FETCH_WORKERS", 16))
+FETCH_DEADLINE = float(os.getenv("SCRAPER_FETCH_DEADLINE", 20))
 
-def fetch_feed_with_timeout(rss_url, timeout=10):
-    """Fetch RSS feed with timeout support using requests"""
+feed_flight = SingleFlight("feeds")
+
+
+def fetch_feed_with_timeout(pub, timeout=10):
+    """
+    Fetch a publisher's RSS feed over the shared transport pool and
+    return its articles. Concurrent fetches of the same URL share a single
+    in-flight request.
+    """
+    return feed_flight.do(pub["rss"], _fetch_feed, pub, timeout)
+
+
+def _fetch_feed(pub, timeout):
+    """
+    Sends conditional requests using cached validators and only parses
+    the feed when its body has actually changed.
+    """
+    rss_url = pub["rss"]
+    cached = feed_cache.get(rss_url)
     try:
-        # Use requests with timeout to fetch the feed content first
-        response = requests.get(rss_url, timeout=timeout, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
+        # Pooled keep-alive connection; only the first fetch of a host pays for the handshake
+        with stage_timer("fetch", log=False):
+            # `timeout` is the budget for every attempt together, not each one
+            response = transport.get(rss_url, budget=timeout, retries=FEED_RETRIES, follow_redirects=True, headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                **feed_cache.conditional_headers(rss_url)
+            })
+
+        if response.status_code == 304 and cached:
+            feed_cache.record("not_modified")
+            return feed_cache.revalidate(rss_url)["articles"]
 
-        # Parse the fetched content with feedparser
-        return feedparser.parse(response.content)
-    except requests.Timeout:
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        # Some servers ignore validators; skip the reparse if the body is identical
+        if cached and cached["digest"] == digest(response.content):
+            feed_cache.record("unchanged")
+            return feed_cache.revalidate(rss_url, etag, last_modified)["articles"]
+
+        # Parse the fetched content; only the reduced articles outlive this call
+        with stage_timer("parse", log=False):
+            articles = fingerprint_articles([entry_to_article(entry, pub) for entry in parse_entries(response.content)])
+        feed_cache.record("parsed")
+        feed_cache.store(rss_url, response.content, articles, etag, last_modified)
+        return articles
+    except httpx.TimeoutException:
         raise TimeoutError(f"Feed fetch timed out after {timeout}s")
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise Exception(f"Failed to fetch feed: {str(e)}")
 
-def extract_author(entry, author_fields):
-    for field in author_fields:
-        value = entry.get(field)
-        if value:
-            return value.replace("By ", "").strip()
-    return ""
-
-def parse_name(full_name):
-    """
-    Parse a full name string into (first_name, last_name) tuples.
-    Handles multiple authors separated by 'and', '&', or commas.
-    Returns a list of (first_name, last_name) tuples.
-    """
-    if not full_name:
-        return []
-
-    bad_terms = ["Editorial", "Staff", "Team", "Newsroom"]
-    if any(bad.lower() in full_name.lower() for bad in bad_terms):
-        return []
-
-    # Split by common delimiters for multiple authors
-    # Handle patterns like: "John Doe and Jane Smith" or "A, B and C"
-    import re
-
-    # Replace various separators with a uniform delimiter
-    normalized = full_name
-    normalized = re.sub(r'\s+and\s+', '|', normalized, flags=re.IGNORECASE)
-    normalized = re.sub(r'\s*&\s*', '|', normalized)
-
-    # Split by the delimiter
-    author_names = [name.strip() for name in normalized.split('|')]
-
-    # Also handle comma-separated lists (but not commas within names)
-    # This handles "Smith, Jones and Brown"
-    expanded_names = []
-    for name in author_names:
-        # Check if this looks like "Last1, Last2, Last3" pattern
-        if ',' in name:
-            parts = [p.strip() for p in name.split(',')]
-            # If all parts are single words (likely last names only), skip
-            if all(len(p.split()) == 1 for p in parts):
-                continue
-            expanded_names.extend(parts)
-        else:
-            expanded_names.append(name)
 
-    # Parse each individual name
-    results = []
-    for name in expanded_names:
-        name = name.strip()
-        if not name:
-            continue
+def fetch_publisher_feed(pub, timeout=FEED_TIMEOUT):
+    """
+    Fetch one publisher's feed through its circuit breaker, with a timeout
+    adapted to the feed's observed latency (never above `timeout`).
+    Returns the feed's articles.
+    """
+    health = publisher_health.get(pub)
+    if not health.allow():
+        raise CircuitOpenError(f"Circuit open for {pub['name']}, skipping until the next probe")
 
-        parts = name.split()
-        if len(parts) == 1:
-            # Single name - use as first name only
-            results.append((parts[0], ""))
-        elif len(parts) >= 2:
-            # Multiple parts - first is first_name, rest is last_name
-            first = parts[0]
-            last = " ".join(parts[1:])
-            results.append((first, last))
+    t0 = time.monotonic()
+    try:
+        articles = fetch_feed_with_timeout(pub, timeout=health.timeout(timeout))
+    except Exception as e:
+        health.record_failure(e)
+        raise
+    health.record_success(time.monotonic() - t0)
+    return articles
+
+
+def record_fetch(result, log=True):
+    """Metrics and a log line for one fetch_publishers result"""
+    pub = result["publisher"]
+    PUBLISHER_FETCH_SECONDS.labels(pub["name"], result["status"]).observe(result["latency"])
+    if result["status"] != "ok":
+        ERRORS.labels("fetch", result["status"]).inc()
+    if log:
+        log_event("publisher_fetch", publisher=pub["name"], status=result["status"],
+                  latency=round(result["latency"], 4), error=result["error"])
+
+
+def fetch_publishers(publishers, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE, max_workers=FETCH_MAX_WORKERS):
+    """
+    Fetch all publisher feeds concurrently, yielding one result dict per
+    publisher as soon as it finishes.
+
+    Each result has the publisher, the feed's articles (or None), a status of
+    "ok", "timeout", "error", "circuit_open" or "deadline", and the fetch
+    latency in seconds.
+    Publishers still running when the global deadline expires are reported
+    with status "deadline" and abandoned.
+    """
+    if not publishers:
+        return
 
-    return results
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(publishers))))
 
+    def fetch(pub):
+        result = _fetch(pub)
+        record_fetch(result)
+        return result
 
-def scrape_journalists_from_publishers(topic: str, geography: str = None):
-    journalists = defaultdict(lambda: {
-        "first_name": "",
-        "last_name": "",
-        "publication_name": "",
-        "domain": "",
-        "topics": set(),
-        "recent_articles": []
-    })
+    def _fetch(pub):
+        t0 = time.monotonic()
+        try:
+            articles = fetch_publisher_feed(pub, timeout=timeout)
+            return {"publisher": pub, "articles": articles, "status": "ok", "error": None,
+                    "latency": time.monotonic() - t0}
+        except CircuitOpenError as e:
+            return {"publisher": pub, "articles": None, "status": "circuit_open", "error": str(e),
+                    "latency": 0.0}
+        except TimeoutError as e:
+            return {"publisher": pub, "articles": None, "status": "timeout", "error": str(e),
+                    "latency": time.monotonic() - t0}
+        except Exception as e:
+            return {"publisher": pub, "articles": None, "status": "error", "error": str(e),
+                    "latency": time.monotonic() - t0}
 
-    # Parse topic keywords for matching
-    # Extract meaningful keywords from phrases like "AI in EdTech, AI in Education"
-    import re
+    # Run each fetch in a copy of the caller's context so logs keep the request id
+    pending = {executor.submit(contextvars.copy_context().run, fetch, pub): pub for pub in publishers}
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                yield future.result()
+
+        elapsed = time.monotonic() - started
+        for future, pub in pending.items():
+            future.cancel()
+            ERRORS.labels("fetch", "deadline").inc()
+            yield {"publisher": pub, "articles": None, "status": "deadline",
+                   "error": f"Global fetch deadline of {deadline}s exceeded", "latency": elapsed}
+    finally:
+        # Don't block the request on feeds that blew the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_topic_keywords(topic):
+    """
+    Extract meaningful keywords from phrases like "AI in EdTech, AI in Education"
+    """
     topic_keywords = []
     for phrase in topic.split(','):
-        phrase = phrase.strip().lower()
-        # Extract key terms (remove common words like 'in', 'the', 'of', 'and')
-        words = re.findall(r'\b\w+\b', phrase)
-        # Filter out stop words
-        stop_words = {'in', 'the', 'of', 'and', 'or', 'a', 'an', 'to', 'for'}
-        meaningful_words = [w for w in words if w not in stop_words and len(w) > 2]
-        topic_keywords.extend(meaningful_words)
+        # Same tokenization as the article index, so keywords hit its posting lists
+        topic_keywords.extend(tokenize(phrase))
 
     # Remove duplicates while preserving order
-    topic_keywords = list(dict.fromkeys(topic_keywords))
-    print(f"Topic keywords for matching: {topic_keywords}")
+    return list(dict.fromkeys(topic_keywords))
+
 
-    # Filter publishers by geography if specified
-    publishers_to_scrape = PUBLISHERS
+def select_publishers(geography=None, publishers=None):
+    """
+    Filter publishers by geography using the registry's precomputed region
+    index. Pass `publishers` to filter an explicit list instead.
+    """
+    index = registry.current() if publishers is None else PublisherIndex(publishers, registry.index.aliases)
+    selected = index.select(geography)
     if geography and geography.strip():
-        geography_lower = geography.lower().strip()
-
-        # Map common geography terms to publisher regions
-        region_mapping = {
-            'us': ['Northeast', 'West Coast', 'National', 'Midwest', 'Southeast', 'Southwest',
-                   'Mid-Atlantic', 'Mountain West', 'Pacific Northwest'],
-            'usa': ['Northeast', 'West Coast', 'National', 'Midwest', 'Southeast', 'Southwest',
-                    'Mid-Atlantic', 'Mountain West', 'Pacific Northwest'],
-            'united states': ['Northeast', 'West Coast', 'National', 'Midwest', 'Southeast', 'Southwest',
-                              'Mid-Atlantic', 'Mountain West', 'Pacific Northwest'],
-            'northeast': ['Northeast'],
-            'west coast': ['West Coast'],
-            'east coast': ['Northeast', 'Mid-Atlantic'],
-            'national': ['National'],
-            'midwest': ['Midwest'],
-            'south': ['Southeast', 'Southwest'],
-            'southeast': ['Southeast'],
-            'southwest': ['Southwest'],
-            'mid-atlantic': ['Mid-Atlantic'],
-            'mountain west': ['Mountain West'],
-            'pacific northwest': ['Pacific Northwest'],
-            'global': None,  # None means all publishers
-            'international': ['International']
-        }
-
-        # Get matching regions
-        matching_regions = region_mapping.get(geography_lower)
-
-        if matching_regions is not None:
-            # Filter publishers by matching regions
-            publishers_to_scrape = [
-                pub for pub in PUBLISHERS
-                if pub.get('region') in matching_regions
-            ]
-            print(f"Filtered to {len(publishers_to_scrape)} publishers for geography '{geography}'")
-            print(f"Regions included: {matching_regions}")
-        else:
-            # If geography specified but not recognized, try partial match on region
-            publishers_to_scrape = [
-                pub for pub in PUBLISHERS
-                if geography_lower in pub.get('region', '').lower()
-            ]
-            if publishers_to_scrape:
-                print(f"Partial match: {len(publishers_to_scrape)} publishers for geography '{geography}'")
-            else:
-                print(f"Geography '{geography}' not recognized, using all publishers")
-                publishers_to_scrape = PUBLISHERS
-
-    total_articles_checked = 0
-    matched_articles = 0
-    articles_with_authors = 0
-
-    for idx, pub in enumerate(publishers_to_scrape, 1):
-        print(f"[{idx}/{len(publishers_to_scrape)}] Fetching RSS from {pub['name']}...")
-        try:
-            feed = fetch_feed_with_timeout(pub["rss"], timeout=10)
-            print(f"  Found {len(feed.entries)} articles")
-        except TimeoutError:
-            print(f"  TIMEOUT after 10s - skipping {pub['name']}")
-            continue
-        except Exception as e:
-            print(f"  ERROR fetching {pub['name']}: {e}")
-            continue
+        print(f"Selected {len(selected)} of {len(index.publishers)} publishers for geography '{geography}'")
+    return selected
 
-        pub_matched = 0
-        for entry in feed.entries[:20]:
-            total_articles_checked += 1
 
-            # Check if article matches topic keywords
-            article_title = entry.get("title", "").lower()
-            article_summary = entry.get("summary", "").lower()
-            article_text = f"{article_title} {article_summary}"
+def article_timestamp(entry):
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if parsed:
+        return calendar.timegm(parsed)
+    return time.time()
+
+
+def entry_to_article(entry, pub):
+    """Reduce a feedparser entry to the fields the matcher needs"""
+    title = entry.get("title", "")
+    return Article(
+        id=entry.get("id") or entry.get("link") or title,
+        title=title,
+        link=entry.get("link", ""),
+        published=entry.get("published", ""),
+        timestamp=article_timestamp(entry),
+        author=extract_author(entry, pub["author_fields"]),
+        # The summary is only needed for matching, so keep its terms rather than the text
+        terms=article_terms(title, entry.get("summary", "")),
+    )
 
-            # Must match at least one keyword
-            if not any(keyword in article_text for keyword in topic_keywords):
-                continue
 
-            matched_articles += 1
-            pub_matched += 1
+def new_journalist_index():
+    """Journalists of one query, by journalist key"""
+    return {}
 
-            author_raw = extract_author(entry, pub["author_fields"])
-            parsed_authors = parse_name(author_raw)
 
-            if not parsed_authors:
+def new_match_stats():
+    return {"checked": 0, "matched": 0, "with_authors": 0}
+
+
+def index_feed(pub, articles):
+    """
+    Keyword index for a feed's articles. It is kept on the feed cache
+    entry, so an unchanged feed is only indexed once.
+    """
+    cached = feed_cache.get(pub["rss"])
+    if cached is not None and cached["articles"] is articles and "index" in cached:
+        return cached["index"]
+
+    index = build_index(articles)
+    if cached is not None and cached["articles"] is articles:
+        cached["index"] = index
+    record_bylines(pub, articles)
+    return index
+
+
+def record_bylines(pub, articles):
+    """Fold a freshly parsed feed into the persistent journalist profiles"""
+    bylines = []
+    for article in articles:
+        authors = [(first, last) for first, last in parse_name(article.author) if first]
+        if authors:
+            bylines.append((article, authors))
+    try:
+        get_journalist_store().record_articles(pub, bylines)
+    except Exception as e:
+        # The profile store is a side channel; never fail a scrape over it
+        ERRORS.labels("journalist_store", type(e).__name__).inc()
+        print(f"Journalist store update failed for {pub['name']}: {e}")
+
+
+def collect_journalists(pub, matched_articles, journalists, stats, topic_keywords=()):
+    """
+    Add the authors of one publisher's topic-matching articles to `journalists`.
+    Query keywords found in an author's articles are added to their topics.
+    """
+    with stage_timer("name_parsing", log=False):
+        _collect_journalists(pub, matched_articles, journalists, stats, set(topic_keywords))
+
+
+def _collect_journalists(pub, matched_articles, journalists, stats, topic_keywords):
+    for article in matched_articles:
+        stats["matched"] += 1
+        article_topics = topic_keywords.intersection(article.terms)
+
+        parsed_authors = parse_name(article.author)
+
+        if not parsed_authors:
+            continue
+
+        stats["with_authors"] += 1
+
+        # Create separate entries for each co-author
+        for first_name, last_name in parsed_authors:
+            if not first_name:
                 continue
 
-            articles_with_authors += 1
+            key = journalist_key(first_name, last_name, pub["domain"])
+
+            journalist = journalists.get(key)
+            if journalist is None:
+                journalist = journalists[key] = Journalist(first_name, last_name, pub["name"], pub["domain"])
+            journalist.topics.update(article_topics)
+            journalist.articles.append(article)
+
+
+def report_match_stats(stats, journalists):
+    record_articles(stats)
+    log_event("match_summary", journalists=len(journalists), **stats)
+    print(f"Total articles checked: {stats['checked']}")
+    print(f"Articles matching topic: {stats['matched']}")
+    print(f"Articles with valid authors: {stats['with_authors']}")
+    print(f"Unique journalists found: {len(journalists)}")
+
+
+def merge_journalists(journalists, other):
+    """Fold another journalist index into `journalists`"""
+    for key, journalist in other.items():
+        existing = journalists.get(key)
+        if existing is None:
+            journalists[key] = journalist
+        else:
+            existing.topics.update(journalist.topics)
+            existing.articles.extend(journalist.articles)
+
+
+def finalize_journalists(journalists, topic_keywords=(), limit=None):
+    """
+    The query's journalists, best match first, at most `limit` of them.
+    Syndicated copies are collapsed and ranking happens before enrichment,
+    so Hunter is only asked about the top N distinct people.
+    """
+    with stage_timer("dedup", log=False):
+        stats = dedupe_journalists(journalists)
+    DEDUP.labels("articles").inc(stats["duplicate_articles"])
+    DEDUP.labels("journalists").inc(stats["merged_journalists"])
+    with stage_timer("ranking", log=False):
+        return rank_journalists(list(journalists.values()), topic_keywords, limit)
+
+
+def iter_feed_matches(publishers, topic_keywords, stats, deadline=FETCH_DEADLINE):
+    """
+    Fetch publishers concurrently, yielding each fetch result together with
+    its topic-matching articles as soon as that feed has been parsed.
+    """
+    total = len(publishers)
+    for idx, result in enumerate(fetch_publishers(publishers, deadline=deadline), 1):
+        pub = result["publisher"]
+        prefix = f"[{idx}/{total}] {pub['name']} ({result['latency']:.2f}s)"
+
+        if result["status"] != "ok":
+            print(f"{prefix} {result['status'].upper()} - skipping: {result['error']}")
+            yield result, []
+            continue
 
-            # Create separate entries for each co-author
-            for first_name, last_name in parsed_authors:
-                if not first_name:
-                    continue
+        articles = result["articles"]
+        print(f"{prefix} Found {len(articles)} articles")
 
-                key = f"{first_name}-{last_name}-{pub['domain']}"
+        with stage_timer("match", log=False):
+            index = index_feed(pub, articles)
+            matched = [articles[position] for position in sorted(index.match_any(topic_keywords))]
+        stats["checked"] += len(articles)
 
-                journalist = journalists[key]
-                journalist["first_name"] = first_name
-                journalist["last_name"] = last_name
-                journalist["publication_name"] = pub["name"]
-                journalist["domain"] = pub["domain"]
+        if matched:
+            print(f"  ✓ Matched {len(matched)} topic-relevant articles")
+        yield result, matched
 
-                journalist["recent_articles"].append({
-                    "title": entry.get("title", ""),
-                    "url": entry.get("link", ""),
-                    "published": entry.get("published", "")
-                })
 
-        if pub_matched > 0:
-            print(f"  ✓ Matched {pub_matched} topic-relevant articles")
+def scrape_journalists_from_publishers(topic: str, geography: str = None, limit: int = None):
+    journalists = new_journalist_index()
+
+    # Parse topic keywords for matching
+    topic_keywords = parse_topic_keywords(topic)
+    print(f"Topic keywords for matching: {topic_keywords}")
+
+    publishers_to_scrape = select_publishers(geography)
+    stats = new_match_stats()
+
+    print(f"Fetching {len(publishers_to_scrape)} RSS feeds concurrently "
+          f"(timeout {FEED_TIMEOUT}s per feed, deadline {FETCH_DEADLINE}s)...")
+    fetch_started = time.monotonic()
+    fetch_stats = defaultdict(int)
+
+    pool = get_worker_pool()
+    if pool is not None:
+        # Fetch, parse and match in worker processes; only matched journalists come back
+        for results, shard_stats, shard_journalists in pool.scrape(publishers_to_scrape, topic_keywords,
+                                                                    FETCH_DEADLINE):
+            for result in results:
+                fetch_stats[result["status"]] += 1
+                # Workers log their fetches, but their metrics die with them
+                record_fetch(result, log=False)
+            for name, count in shard_stats.items():
+                stats[name] += count
+            merge_journalists(journalists, shard_journalists)
+    else:
+        for result, matched in iter_feed_matches(publishers_to_scrape, topic_keywords, stats):
+            fetch_stats[result["status"]] += 1
+            collect_journalists(result["publisher"], matched, journalists, stats, topic_keywords)
+
+    fetch_wall = time.monotonic() - fetch_started
+    log_event("scrape_summary", topic=topic, geography=geography, publishers=len(publishers_to_scrape),
+              wall_seconds=round(fetch_wall, 4), feed_status=dict(fetch_stats))
 
     print(f"\n--- Scraping Statistics ---")
-    print(f"Total articles checked: {total_articles_checked}")
-    print(f"Articles matching topic: {matched_articles}")
-    print(f"Articles with valid authors: {articles_with_authors}")
-    print(f"Unique journalists found: {len(journalists)}")
+    print(f"Feed fetch wall time: {fetch_wall:.2f}s")
+    print(f"Feed status: {dict(fetch_stats)}")
+    print(f"Feed cache: {feed_cache.stats()}")
+    report_match_stats(stats, journalists)
     print(f"---------------------------\n")
 
-    return [
-        {
-            **j,
-            "topics": list(j["topics"]),
-            "recent_articles": j["recent_articles"][:5]
-        }
-        for j in journalists.values()
+    return finalize_journalists(journalists, topic_keywords, limit)
+
+
+def scrape_journalists_batch(queries):
+    """
+    Answer several (topic, geography) queries with one fetch per feed.
+    `queries` is a list of dicts with "topic" and optional "geography"
+    and "limit".
+    Returns one journalist list per query, in order.
+    """
+    resolved = [
+        (parse_topic_keywords(q["topic"]), select_publishers(q.get("geography")))
+        for q in queries
     ]
+
+    # Union of every query's publishers, each fetched once
+    union = {}
+    for _, publishers in resolved:
+        for pub in publishers:
+            union.setdefault(pub["rss"], pub)
+
+    print(f"Batch of {len(queries)} queries covers {len(union)} unique feeds")
+    fetch_started = time.monotonic()
+    fetch_stats = defaultdict(int)
+    indexed_feeds = {}
+    for result in fetch_publishers(list(union.values())):
+        fetch_stats[result["status"]] += 1
+        if result["status"] == "ok":
+            pub = result["publisher"]
+            indexed_feeds[pub["rss"]] = result["articles"], index_feed(pub, result["articles"])
+    fetch_wall = time.monotonic() - fetch_started
+    log_event("batch_fetch_summary", queries=len(queries), feeds=len(union),
+              wall_seconds=round(fetch_wall, 4), feed_status=dict(fetch_stats))
+    print(f"Feed fetch wall time: {fetch_wall:.2f}s, status: {dict(fetch_stats)}")
+
+    results = []
+    for (topic_keywords, publishers), query in zip(resolved, queries):
+        journalists = new_journalist_index()
+        stats = new_match_stats()
+        for pub in publishers:
+            if pub["rss"] not in indexed_feeds:
+                continue
+            articles, index = indexed_feeds[pub["rss"]]
+            stats["checked"] += len(articles)
+            with stage_timer("match", log=False):
+                matched = [articles[position] for position in sorted(index.match_any(topic_keywords))]
+            collect_journalists(pub, matched, journalists, stats, topic_keywords)
+        record_articles(stats)
+        print(f"Query '{query['topic']}' ({query.get('geography') or 'all'}): "
+              f"{stats['matched']} matching articles, {len(journalists)} journalists")
+        results.append(finalize_journalists(journalists, topic_keywords, query.get("limit")))
+
+    return results
@@ -0,0 +1,282 @@
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from feed_cache import feed_cache
+from metrics import request_id_var
+from models import Article, Journalist
+from publisher_health import publisher_health
+
+# Worker processes that feed fetching, parsing and matching are sharded
+# across; 0 keeps everything on the threads of the serving process
+SCRAPER_PROCESSES = int(os.getenv("SCRAPER_PROCESSES", 0))
+# Extra time a shard gets past the fetch deadline to parse, match and reply
+SHARD_GRACE = float(os.getenv("SCRAPER_SHARD_GRACE", 10))
+# How often a scrape checks whether its queued shards have started
+QUEUE_POLL_SECONDS = 0.5
+
+ARTICLE_FIELDS = ("id", "title", "link", "published", "timestamp", "author", "terms", "url_key", "signature")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pack_journalists(journalists):
+    """
+    Reduce a journalist index to plain tuples for the trip back to the
+    parent: an article table, and per journalist its name, outlet, topics
+    and positions in that table. Articles shared by co-authors are sent once.
+    """
+    articles = []
+    positions = {}
+    packed = []
+    for journalist in journalists.values():
+        refs = []
+        for article in journalist.articles:
+            position = positions.get(id(article))
+            if position is None:
+                position = positions[id(article)] = len(articles)
+                articles.append(tuple(getattr(article, name) for name in ARTICLE_FIELDS))
+            refs.append(position)
+        packed.append((journalist.first_name, journalist.last_name, journalist.publication_name,
+                       journalist.domain, tuple(journalist.topics), tuple(refs)))
+    return articles, packed
+
+
+def unpack_journalists(articles, packed):
+    """Rebuild the journalist index sent by pack_journalists"""
+    articles = [Article(*fields) for fields in articles]
+    journalists = {}
+    for first_name, last_name, publication_name, domain, topics, refs in packed:
+        journalist = Journalist(first_name, last_name, publication_name, domain)
+        journalist.topics.update(topics)
+        journalist.articles.extend(articles[position] for position in refs)
+        journalists[journalist.key] = journalist
+    return journalists
+
+
+def scrape_shard(publishers, topic_keywords, deadline, request_id=None):
+    """
+    Worker side: fetch, parse and match one shard of publishers, giving up
+    on feeds still fetching `deadline` seconds after it starts. Returns
+    (fetch results, match stats, packed journalists, worker state); each
+    fetch result is (rss, status, latency, error), and the state holds the
+    shard's publisher health snapshots and this process's feed cache stats.
+    """
+    # Imported here so the parent can import this module from run_scraper
+    from run_scraper import collect_journalists, iter_feed_matches, new_journalist_index, new_match_stats
+
+    request_id_var.set(request_id)
+    journalists = new_journalist_index()
+    stats = new_match_stats()
+    results = []
+    for result, matched in iter_feed_matches(publishers, topic_keywords, stats, deadline):
+        results.append((result["publisher"]["rss"], result["status"], result["latency"], result["error"]))
+        collect_journalists(result["publisher"], matched, journalists, stats, topic_keywords)
+    # The shard's breakers and feed cache live here; report them for the parent's endpoints
+    state = {
+        "health": [publisher_health.get(pub).snapshot() for pub in publishers],
+        "feed_cache": feed_cache.stats(),
+    }
+    return results, stats, pack_journalists(journalists), state
+
+
+def _warm_up():
+    import run_scraper  # noqa: F401
+    return os.getpid()
+
+
+def shard_of(pub, shards):
+    # Stable across processes and restarts, unlike hash()
+    return zlib.crc32(pub["rss"].encode()) % shards
+
+
+class _Worker:
+    """One shard's worker process, and the last scrape queued on it"""
+
+    def __init__(self, context):
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+        self.tail = None
+
+    def terminate(self):
+        # The executor can't stop a running task, so kill its process; queued
+        # futures then fail with BrokenProcessPool instead of being cancelled
+        for process in list((self.executor._processes or {}).values()):
+            process.terminate()
+        self.executor.shutdown(wait=False)
+
+
+class _ShardScrape:
+    """One request's scrape of one shard; `started` is set once its worker picks it up"""
+
+    def __init__(self, shard, members):
+        self.shard = shard
+        self.members = members
+        self.worker = None
+        self.started = None
+        self.retried = False
+
+    def mark_started(self, _=None):
+        self.started = time.monotonic()
+
+
+class WorkerPool:
+    """
+    Shards publishers across worker processes. Each shard is its own
+    single-process executor and a feed always hashes to the same shard,
+    so its feed cache entry, ETag, circuit breaker and keep-alive
+    connection stay warm in one worker; concurrent scrapes queue per
+    shard, so a feed is never fetched twice at once. Workers are spawned
+    rather than forked, since the serving process is full of threads.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [None] * processes
+        self._lock = threading.Lock()
+
+    def _worker(self, shard):
+        # Callers hold self._lock
+        if self._workers[shard] is None:
+            self._workers[shard] = _Worker(self._context)
+        return self._workers[shard]
+
+    def _submit(self, task, *args):
+        with self._lock:
+            worker = self._worker(task.shard)
+            try:
+                future = worker.executor.submit(scrape_shard, *args)
+            except RuntimeError:
+                # BrokenProcessPool after a crash: start a fresh process
+                worker = self._workers[task.shard] = _Worker(self._context)
+                future = worker.executor.submit(scrape_shard, *args)
+            previous, worker.tail = worker.tail, future
+        task.worker = worker
+        if previous is None:
+            task.mark_started()
+        else:
+            # The shard's one process works through its queue in order, so
+            # this scrape starts when the one before it ends
+            previous.add_done_callback(task.mark_started)
+        return future
+
+    def _retire(self, shard, worker):
+        """Send new work for `shard` to a fresh process and kill `worker`'s"""
+        with self._lock:
+            if self._workers[shard] is worker:
+                self._workers[shard] = None
+        worker.terminate()
+
+    def start(self):
+        """Spawn every worker and import the scraper there, so the first scrape doesn't pay for it"""
+        with self._lock:
+            futures = [self._worker(shard).executor.submit(_warm_up) for shard in range(self.processes)]
+        for future in futures:
+            future.result()
+
+    def scrape(self, publishers, topic_keywords, deadline):
+        """
+        Run scrape_shard for every non-empty shard of `publishers`, yielding
+        (fetch results, match stats, journalist index) per shard as each
+        finishes. Fetch results are dicts shaped like fetch_publishers'
+        (without articles). Workers enforce the fetch `deadline` themselves,
+        counted from when they start on a shard rather than while it queues
+        behind other requests; a worker still busy SHARD_GRACE later is
+        taken to be hung and replaced. A shard whose worker dies is retried
+        once on a fresh process; one that crashes again or hangs is
+        reported as failed fetches of all its feeds. Each finished shard's
+        publisher health and feed cache stats are copied into this process's
+        registries, so /health/publishers and /cache/stats cover the workers.
+        """
+        shards = [[] for _ in range(self.processes)]
+        for pub in publishers:
+            shards[shard_of(pub, self.processes)].append(pub)
+        by_feed = {pub["rss"]: pub for pub in publishers}
+        args = (list(topic_keywords), deadline, request_id_var.get())
+        budget = deadline + SHARD_GRACE
+
+        pending = {}
+        for shard, members in enumerate(shards):
+            if members:
+                task = _ShardScrape(shard, members)
+                pending[self._submit(task, members, *args)] = task
+
+        while pending:
+            now = time.monotonic()
+            for future, task in list(pending.items()):
+                if task.started is not None and now - task.started >= budget and not future.done():
+                    del pending[future]
+                    # A hung worker would hold up every later scrape of its shard
+                    self._retire(task.shard, task.worker)
+                    yield _failed(task.members, "deadline", f"Scrape worker {task.shard} missed the {deadline}s "
+                                  "deadline", now - task.started), {}, {}
+            if not pending:
+                break
+
+            timeouts = [task.started + budget - now for task in pending.values() if task.started is not None]
+            if len(timeouts) < len(pending):
+                # Queued shards have no clock yet; look again shortly to start theirs
+                timeouts.append(QUEUE_POLL_SECONDS)
+            done, _ = wait(pending, timeout=max(0.0, min(timeouts)), return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                try:
+                    results, stats, (articles, packed), state = future.result()
+                except BrokenProcessPool as e:
+                    # The worker died: it crashed (OOM, a segfault in a parser)
+                    # or was killed for hanging on another request's shard
+                    self._retire(task.shard, task.worker)
+                    if not task.retried:
+                        task.retried = True
+                        task.started = None
+                        pending[self._submit(task, task.members, *args)] = task
+                        continue
+                    yield _failed(task.members, "error", f"Scrape worker {task.shard} crashed: {e}", 0.0), {}, {}
+                    continue
+                except Exception as e:
+                    yield _failed(task.members, "error", str(e), 0.0), {}, {}
+                    continue
+                publisher_health.report(state["health"])
+                feed_cache.report(task.shard, state["feed_cache"])
+                fetch_results = [
+                    {"publisher": by_feed[rss], "articles": None, "status": status, "error": error,
+                     "latency": latency}
+                    for rss, status, latency, error in results
+                ]
+                yield fetch_results, stats, unpack_journalists(articles, packed)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, [None] * self.processes
+        for worker in workers:
+            if worker is not None:
+                worker.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _failed(members, status, error, latency):
+    return [{"publisher": pub, "articles": None, "status": status, "error": error, "latency": latency}
+            for pub in members]
+
+
+def get_worker_pool():
+    """The shared worker pool, or None when SCRAPER_PROCESSES is 0"""
+    global _pool
+    if SCRAPER_PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(SCRAPER_PROCESSES)
+        return _pool
+
+
+def close_worker_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from enrichment import HUNTER_CONCURRENCY, arecord_enrichments, enrich_journalist, record_enrichments
+from run_scraper import (
+    collect_journalists,
+    finalize_journalists,
+    iter_feed_matches,
+    new_journalist_index,
+    new_match_stats,
+    parse_topic_keywords,
+    scrape_journalists_from_publishers,
+    select_publishers,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Enrichment results saved to the journalist store per transaction
+STORE_BATCH = 50
+
+
+def format_ndjson(event, data):
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def iter_live_journalists(topic, geography=None):
+    """
+    Live scrape as a generator: yields (fetch summary, journalists) for each
+    publisher as soon as its feed has been parsed and matched.
+    """
+    topic_keywords = parse_topic_keywords(topic)
+    publishers = select_publishers(geography)
+    stats = new_match_stats()
+
+    for result, matched in iter_feed_matches(publishers, topic_keywords, stats):
+        journalists = new_journalist_index()
+        collect_journalists(result["publisher"], matched, journalists, stats, topic_keywords)
+        summary = {
+            "publication_name": result["publisher"]["name"],
+            "status": result["status"],
+            "latency": round(result["latency"], 3),
+            "matched_articles": len(matched),
+        }
+        yield summary, finalize_journalists(journalists)
+
+
+async def stream_scrape_events(source, api_key, concurrency=HUNTER_CONCURRENCY):
+    """
+    Turn a stream of (publisher summary, journalists) batches into events.
+
+    Each journalist is emitted as soon as its publisher is parsed, and its
+    Hunter enrichment starts right away; enrichment results are emitted as
+    they resolve, interleaved with later publishers. `source` is an async
+    iterator. Yields (event name, payload) pairs, ending with "done".
+    """
+    queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = set()
+    stats = {"verified": 0, "low_confidence": 0, "fallback": 0, "not_found": 0}
+    journalist_count = 0
+    # Enriched journalists not yet saved to the journalist store
+    unsaved = []
+
+    async def enrich(j):
+        try:
+            async with semaphore:
+                enriched, bucket = await enrich_journalist(j, api_key)
+            await queue.put(("enrichment", enriched, bucket))
+        except Exception as e:
+            await queue.put(("enrichment_error", j, str(e)))
+
+    async def produce():
+        try:
+            async for summary, journalists in source:
+                await queue.put(("publisher", summary, journalists))
+        except Exception as e:
+            # Surface scrape failures instead of silently ending the stream
+            await queue.put(("error", {"detail": str(e)}, None))
+        finally:
+            await queue.put(("end", None, None))
+
+    producer = asyncio.create_task(produce())
+    producing = True
+    # Enrichments started but whose result hasn't been emitted yet
+    outstanding = 0
+    try:
+        while producing or outstanding:
+            kind, payload, extra = await queue.get()
+
+            if kind == "publisher":
+                if payload is not None:
+                    yield "publisher", payload
+                for j in extra:
+                    journalist_count += 1
+                    yield "journalist", {"key": j.key, **j.to_dict()}
+                    outstanding += 1
+                    task = asyncio.create_task(enrich(j))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            elif kind == "enrichment":
+                outstanding -= 1
+                stats[extra] += 1
+                unsaved.append(payload)
+                if len(unsaved) >= STORE_BATCH:
+                    batch, unsaved = unsaved, []
+                    await arecord_enrichments(batch)
+                yield "enrichment", {
+                    "key": payload.key,
+                    "email": payload.email,
+                    "email_confidence": payload.email_confidence,
+                    "email_source": payload.email_source,
+                }
+            elif kind == "enrichment_error":
+                outstanding -= 1
+                yield "error", {"key": payload.key, "detail": extra}
+            elif kind == "error":
+                yield "error", payload
+            else:
+                producing = False
+
+        batch, unsaved = unsaved, []
+        await arecord_enrichments(batch)
+        yield "done", {"journalists": journalist_count, "enrichment": stats}
+    finally:
+        # Client went away or the stream finished: don't leave work running
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+        if unsaved:
+            # Awaiting here could be cut short by the cancellation; a thread can't
+            asyncio.get_running_loop().run_in_executor(None, record_enrichments, unsaved)
+
+
+def live_source(topic, geography=None):
+    # The live scrape blocks on feed I/O, so drive it from the threadpool
+    return iterate_in_threadpool(iter_live_journalists(topic, geography))
+
+
+async def static_source(journalists):
+    yield None, journalists
+
+
+async def ranked_live_source(topic, geography=None, limit=None):
+    """
+    Live scrape for a top-`limit` request: picking the best N needs every
+    feed, so nothing is emitted until all publishers are in and ranked.
+    """
+    journalists = await run_in_threadpool(scrape_journalists_from_publishers, topic, geography, limit)
+    yield None, journalists
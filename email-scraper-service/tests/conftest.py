@@ -0,0 +1,5 @@
+import os
+
+# The default "ingest" mode starts a background feed poller with the app;
+# tests fetch per request so they never depend on background I/O
+os.environ["SCRAPER_MODE"] = "live"
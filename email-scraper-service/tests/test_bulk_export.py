@@ -0,0 +1,132 @@
+"""
+JournalistImporter against the SQLite stand-in for the journalists table.
+
+    python -m pytest tests
+"""
+import csv
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from bulk_export import CSV_NULL, EXPORT_COLUMNS, JournalistImporter, connect_sqlite, csv_chunks, export_row  # noqa: E402
+
+
+def journalist(first, last, email=None, source="hunter", confidence=90, domain="example.com"):
+    return {
+        "first_name": first, "last_name": last, "email": email, "domain": domain,
+        "publication_name": "Example", "topics": ["ai"], "recent_articles": [],
+        "email_confidence": confidence if email else 0, "email_source": source if email else "none",
+    }
+
+
+def rows(*journalists):
+    return [export_row(j) for j in journalists]
+
+
+def table(conn):
+    return conn.execute(
+        "SELECT first_name, last_name, domain, email, email_confidence FROM journalists ORDER BY id"
+    ).fetchall()
+
+
+@pytest.fixture
+def conn():
+    conn = connect_sqlite(":memory:")
+    yield conn
+    conn.close()
+
+
+def test_inserts_then_upserts(conn):
+    importer = JournalistImporter(conn, chunk_rows=2)
+    stats = importer.import_rows(rows(
+        journalist("Ada", "Lovelace", "ada@example.com"),
+        journalist("Alan", "Turing", "alan@example.com"),
+        journalist("Grace", "Hopper"),
+    ))
+    assert stats == {"rows": 3, "statements": 3, "adopted_emails": 0}
+    assert len(table(conn)) == 3
+
+    stats = importer.import_rows(rows(
+        journalist("Ada", "Lovelace", "ada@example.com", confidence=99),
+        journalist("Grace", "Hopper"),
+        journalist("Katherine", "Johnson"),
+    ))
+    assert stats["rows"] == 3
+    assert table(conn) == [
+        ("Ada", "Lovelace", "example.com", "ada@example.com", 99),
+        ("Alan", "Turing", "example.com", "alan@example.com", 90),
+        ("Grace", "Hopper", "example.com", None, 0),
+        ("Katherine", "Johnson", "example.com", None, 0),
+    ]
+
+
+def test_duplicate_keys_keep_the_most_confident_row(conn):
+    stats = JournalistImporter(conn).import_rows(rows(
+        journalist("Ada", "Lovelace", "ada@example.com", confidence=60),
+        journalist("Ada", "Lovelace", "ada@example.com", confidence=95),
+    ))
+    assert stats["rows"] == 1
+    assert table(conn) == [("Ada", "Lovelace", "example.com", "ada@example.com", 95)]
+
+
+def test_found_email_is_adopted_by_the_name_only_row(conn):
+    importer = JournalistImporter(conn)
+    importer.import_rows(rows(journalist("Grace", "Hopper")))
+    stats = importer.import_rows(rows(journalist("Grace", "Hopper", "grace@example.com")))
+    assert stats["adopted_emails"] == 1
+    assert table(conn) == [("Grace", "Hopper", "example.com", "grace@example.com", 90)]
+
+
+def test_shared_editor_address_is_not_adopted(conn):
+    importer = JournalistImporter(conn)
+    importer.import_rows(rows(journalist("Grace", "Hopper")))
+    stats = importer.import_rows(rows(journalist("Grace", "Hopper", "editor@example.com", source="fallback")))
+    assert stats["adopted_emails"] == 0
+    assert [row[3] for row in table(conn)] == [None]
+
+
+def test_reimport_is_idempotent(conn):
+    batch = rows(
+        journalist("Ada", "Lovelace", "ada@example.com"),
+        journalist("Grace", "Hopper"),
+        journalist("Alan", "Turing", "alan@example.com", domain="other.com"),
+    )
+    importer = JournalistImporter(conn)
+    importer.import_rows(batch)
+    before = table(conn)
+    stats = importer.import_rows(batch)
+    assert stats["adopted_emails"] == 0
+    assert table(conn) == before
+
+
+def test_failed_import_rolls_back(conn):
+    importer = JournalistImporter(conn)
+    importer.import_rows(rows(journalist("Ada", "Lovelace", "ada@example.com")))
+    bad = rows(journalist("Alan", "Turing", "alan@example.com"))
+    bad[0]["domain"] = None  # violates NOT NULL
+    with pytest.raises(Exception):
+        importer.import_rows(bad)
+    assert [row[3] for row in table(conn)] == ["ada@example.com"]
+
+
+def copy_rows(text):
+    """Rows as COPY ... WITH (FORMAT csv, HEADER true, NULL '\\N') reads them"""
+    reader = csv.reader(io.StringIO(text))
+    assert tuple(next(reader)) == EXPORT_COLUMNS
+    return [{column: None if value == CSV_NULL else value for column, value in zip(EXPORT_COLUMNS, values)}
+            for values in reader]
+
+
+def test_csv_keeps_empty_names_distinct_from_null():
+    single_name = journalist("Cher", "", "editor@example.com", source="fallback")
+    text = "".join(csv_chunks(rows(single_name, journalist("Ada", "Lovelace", "ada@example.com"))))
+    cher, ada = copy_rows(text)
+    assert cher["first_name"] == "Cher"
+    assert cher["last_name"] == ""
+    assert cher["email"] is None
+    assert ada["email"] == "ada@example.com"
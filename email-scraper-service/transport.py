@@ -0,0 +1,198 @@
+import asyncio
+import importlib.util
+import os
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from metrics import ERRORS
+
+TRANSPORT_TIMEOUT = float(os.getenv("TRANSPORT_TIMEOUT", 10))
+TRANSPORT_MAX_CONNECTIONS = int(os.getenv("TRANSPORT_MAX_CONNECTIONS", 100))
+# Connections (and so in-flight requests) allowed to any one host
+TRANSPORT_PER_HOST = int(os.getenv("TRANSPORT_PER_HOST", 10))
+TRANSPORT_KEEPALIVE_EXPIRY = float(os.getenv("TRANSPORT_KEEPALIVE_EXPIRY", 30))
+TRANSPORT_RETRIES = int(os.getenv("TRANSPORT_RETRIES", 2))
+TRANSPORT_BACKOFF = float(os.getenv("TRANSPORT_BACKOFF", 0.25))
+TRANSPORT_MAX_BACKOFF = float(os.getenv("TRANSPORT_MAX_BACKOFF", 5))
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+HTTP2 = os.getenv("TRANSPORT_HTTP2", "on").lower() in ("1", "true", "on") and importlib.util.find_spec("h2") is not None
+# Compression needs no setup: httpx asks for gzip/deflate, and br/zstd when
+# the brotli/zstandard packages are installed, and decodes transparently
+
+# Worth another attempt: throttling and gateway hiccups
+RETRY_STATUSES = {429, 502, 503, 504}
+# Failures before the request reached the server (or a stale keep-alive
+# connection the server had already closed); read timeouts are not retried
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.PoolTimeout)
+
+_sync_client = None
+_async_client = None
+_client_lock = threading.Lock()
+_sync_hosts = {}
+_async_hosts = {}
+
+
+def _limits():
+    return httpx.Limits(max_connections=TRANSPORT_MAX_CONNECTIONS,
+                        max_keepalive_connections=TRANSPORT_MAX_CONNECTIONS,
+                        keepalive_expiry=TRANSPORT_KEEPALIVE_EXPIRY)
+
+
+def get_sync_client():
+    """Process-wide pooled client for blocking callers (feed fetches run in threads)"""
+    global _sync_client
+    with _client_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(http2=HTTP2, timeout=TRANSPORT_TIMEOUT, limits=_limits())
+        return _sync_client
+
+
+def get_async_client():
+    """Process-wide pooled client for the event loop (Hunter, web discovery)"""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(http2=HTTP2, timeout=TRANSPORT_TIMEOUT, limits=_limits())
+    return _async_client
+
+
+def backoff(attempt, retry_after=None):
+    """Seconds to wait before retry `attempt` (1-based): Retry-After if given, else full jitter"""
+    if retry_after:
+        try:
+            return min(TRANSPORT_MAX_BACKOFF, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(TRANSPORT_MAX_BACKOFF, TRANSPORT_BACKOFF * 2 ** attempt))
+
+
+def _host(url):
+    return urlsplit(str(url)).netloc
+
+
+@contextmanager
+def _sync_host_slot(url):
+    host = _host(url)
+    with _client_lock:
+        if host not in _sync_hosts:
+            _sync_hosts[host] = threading.BoundedSemaphore(TRANSPORT_PER_HOST)
+        slot = _sync_hosts[host]
+    with slot:
+        yield
+
+
+@asynccontextmanager
+async def _async_host_slot(url):
+    host = _host(url)
+    if host not in _async_hosts:
+        _async_hosts[host] = asyncio.Semaphore(TRANSPORT_PER_HOST)
+    async with _async_hosts[host]:
+        yield
+
+
+def _attempt_timeout(deadline):
+    """Seconds left before `deadline`, the timeout for the next attempt"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise httpx.TimeoutException("Request budget spent before the attempt started")
+    return remaining
+
+
+def _time_for(deadline, delay):
+    """Whether a retry after `delay` seconds still starts within the budget"""
+    return deadline is None or time.monotonic() + delay < deadline
+
+
+def request(method, url, retries=TRANSPORT_RETRIES, budget=None, **kwargs):
+    """
+    Blocking request over the shared pool, retried with jittered backoff
+    on connection failures and 429/502/503/504. Returns the last response;
+    raises httpx.HTTPError if every attempt failed to get one.
+
+    `budget`, if given, replaces `timeout` with a total for all attempts
+    and backoff: each attempt's timeout is what is left of it, and no
+    retry is made that couldn't start in time.
+    """
+    client = get_sync_client()
+    deadline = None if budget is None else time.monotonic() + budget
+    for attempt in range(retries + 1):
+        if deadline is not None:
+            kwargs["timeout"] = _attempt_timeout(deadline)
+        try:
+            with _sync_host_slot(url):
+                response = client.request(method, url, **kwargs)
+        except RETRY_ERRORS as e:
+            delay = backoff(attempt + 1)
+            if attempt == retries or not _time_for(deadline, delay):
+                raise
+            ERRORS.labels("transport", type(e).__name__).inc()
+            time.sleep(delay)
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        delay = backoff(attempt + 1, response.headers.get("Retry-After"))
+        if not _time_for(deadline, delay):
+            return response
+        response.close()
+        time.sleep(delay)
+
+
+async def arequest(method, url, retries=TRANSPORT_RETRIES, before_attempt=None, budget=None, **kwargs):
+    """
+    Async counterpart of request(). `before_attempt`, if given, is awaited
+    before every attempt, e.g. to take a rate-limiter token per call; time
+    spent waiting there counts against `budget`.
+    """
+    client = get_async_client()
+    deadline = None if budget is None else time.monotonic() + budget
+    for attempt in range(retries + 1):
+        if before_attempt is not None:
+            await before_attempt()
+        if deadline is not None:
+            kwargs["timeout"] = _attempt_timeout(deadline)
+        try:
+            async with _async_host_slot(url):
+                response = await client.request(method, url, **kwargs)
+        except RETRY_ERRORS as e:
+            delay = backoff(attempt + 1)
+            if attempt == retries or not _time_for(deadline, delay):
+                raise
+            ERRORS.labels("transport", type(e).__name__).inc()
+            await asyncio.sleep(delay)
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        delay = backoff(attempt + 1, response.headers.get("Retry-After"))
+        if not _time_for(deadline, delay):
+            return response
+        await response.aclose()
+        await asyncio.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+async def aget(url, **kwargs):
+    return await arequest("GET", url, **kwargs)
+
+
+def close():
+    global _sync_client
+    with _client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+        _sync_hosts.clear()
+
+
+async def aclose():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    _async_hosts.clear()
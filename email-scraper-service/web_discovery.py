@@ -0,0 +1,42 @@
+import asyncio
+import os
+
+from crawler import Crawler  # noqa: F401 (re-exported for enrichment)
+from email_discovery import discover_email
+from metrics import ERRORS, WEB_DISCOVERY
+
+# Crawl publisher sites for an address before paying for a Hunter lookup
+WEB_DISCOVERY_ENABLED = os.getenv("ENRICHMENT_WEB_DISCOVERY", "off").lower() in ("1", "true", "on")
+# How many of a journalist's recent articles to start crawls from
+WEB_DISCOVERY_ARTICLES = int(os.getenv("ENRICHMENT_WEB_DISCOVERY_ARTICLES", 2))
+WEB_DISCOVERY_TIMEOUT = float(os.getenv("ENRICHMENT_WEB_DISCOVERY_TIMEOUT", 15))
+# An address printed next to the journalist's name on their own outlet's site
+WEB_DISCOVERY_SCORE = 85
+
+
+async def find_email_on_web(first_name, last_name, domain, article_urls, crawler):
+    """
+    (email, score, "web") for an address found on the journalist's
+    articles, author page or the outlet's contact pages, or None. Never
+    raises: a crawl that fails just moves on, and None sends the caller
+    on to Hunter.
+    """
+    for url in list(article_urls)[:WEB_DISCOVERY_ARTICLES]:
+        try:
+            email = await asyncio.wait_for(
+                discover_email(url, first_name, last_name, crawler, domain=domain),
+                WEB_DISCOVERY_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            WEB_DISCOVERY.labels("timeout").inc()
+            return None
+        except Exception as e:
+            # A malformed link or an odd page must not fail the whole enrichment
+            ERRORS.labels("web_discovery", type(e).__name__).inc()
+            WEB_DISCOVERY.labels("error").inc()
+            continue
+        if email:
+            WEB_DISCOVERY.labels("found").inc()
+            return email, WEB_DISCOVERY_SCORE, "web"
+    WEB_DISCOVERY.labels("not_found").inc()
+    return None
@@ -0,0 +1,36 @@
+"""
+Web crawling helpers: polite page fetching, article listings and email discovery.
+
+The crawler and the discovery walk live in the scraper service
+(email-scraper-service/crawler.py and email_discovery.py), which uses them
+as its web enrichment tier; these scripts run them standalone.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent / "email-scraper-service"
+
+
+def _load_service_module(name):
+    """
+    Import one of the service's modules from its file, under the top-level
+    name the service uses for it and as a submodule of this package (so
+    `from .crawler import Crawler` works). The service directory isn't put
+    on sys.path, so its other modules (models, metrics, transport, ...)
+    can't shadow anything for code that imports this package.
+    """
+    path = SERVICE_DIR / f"{name}.py"
+    module = sys.modules.get(name)
+    if module is None or getattr(module, "__file__", None) is None or Path(module.__file__).resolve() != path:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    sys.modules[f"{__name__}.{name}"] = module
+    return module
+
+
+# email_discovery imports crawler by that name, so load it first
+crawler = _load_service_module("crawler")
+email_discovery = _load_service_module("email_discovery")
@@ -1,9 +1,27 @@
-import re
-import requests
+import asyncio
+
+from .crawler import EMAIL_REGEX, Crawler  # noqa: F401 (EMAIL_REGEX used to live here)
+from .email_discovery import belongs_to, discover_email  # noqa: F401
+
+
+async def find_email_async(url, crawler):
+    """First address on the page, scanned as it downloads"""
+    page = await crawler.fetch(url)
+    return page.emails[0] if page and page.emails else None
+
+
+async def _find_emails(urls):
+    crawler = Crawler()
+    try:
+        return await asyncio.gather(*(find_email_async(url, crawler) for url in urls))
+    finally:
+        await crawler.aclose()
 
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
 
 def find_email(url):
-    html = requests.get(url).text
-    emails = re.findall(EMAIL_REGEX, html)
-    return emails[0] if emails else None
\ No newline at end of file
+    return asyncio.run(_find_emails([url]))[0]
+
+
+def find_emails(urls):
+    """find_email for many pages at once, politely and concurrently"""
+    return asyncio.run(_find_emails(list(urls)))
@@ -1,17 +1,42 @@
-import requests
+import asyncio
+
 from bs4 import BeautifulSoup
 
-def scrape_articles(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+from .crawler import Crawler
+
 
+def parse_articles(html):
     articles = []
-    for item in soup.select("article"):
-        title = item.find("h2").get_text()
-        link = item.find("a")["href"]
+    for item in BeautifulSoup(html, "html.parser").select("article"):
+        heading = item.find("h2")
+        anchor = item.find("a", href=True)
+        if heading is None or anchor is None:
+            continue
         articles.append({
-            "title": title,
-            "url": link
+            "title": heading.get_text(strip=True),
+            "url": anchor["href"]
         })
 
-    return articles
\ No newline at end of file
+    return articles
+
+
+async def scrape_articles_async(url, crawler):
+    page = await crawler.fetch(url)
+    return parse_articles(page.html) if page else []
+
+
+async def _scrape_all(urls):
+    crawler = Crawler()
+    try:
+        return await asyncio.gather(*(scrape_articles_async(url, crawler) for url in urls))
+    finally:
+        await crawler.aclose()
+
+
+def scrape_articles(url):
+    return asyncio.run(_scrape_all([url]))[0]
+
+
+def scrape_many(urls):
+    """scrape_articles for many listing pages at once, politely and concurrently"""
+    return asyncio.run(_scrape_all(list(urls)))
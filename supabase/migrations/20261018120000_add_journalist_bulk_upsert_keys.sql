@@ -0,0 +1,23 @@
+/*
+  # Add bulk upsert keys to journalists
+
+  The scraper service exports enriched journalists in bulk
+  (email-scraper-service/bulk_export.py). A row is upserted by its email
+  when it has one, and by first name, last name and domain when it does not.
+
+  1. Modified Tables
+    - `journalists`
+      - `domain` (text) - publication domain, part of the name key
+      - `email` is now nullable, so journalists without a found email can be kept
+
+  2. Indexes
+    - Unique (first_name, last_name, domain) for journalists without an email
+*/
+
+ALTER TABLE journalists ADD COLUMN IF NOT EXISTS domain text NOT NULL DEFAULT '';
+
+ALTER TABLE journalists ALTER COLUMN email DROP NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS journalists_name_domain_key
+  ON journalists (first_name, last_name, domain)
+  WHERE email IS NULL;